@@ -0,0 +1,186 @@
+"""BATCH file writers for syncro streams."""
+
+from __future__ import annotations
+
+import gzip
+import itertools
+import json
+import typing as t
+from abc import abstractmethod
+from dataclasses import dataclass
+from uuid import uuid4
+
+from singer_sdk.batch import BaseBatcher
+from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
+
+from tap_syncro.output import json_default, orjson
+
+try:
+    import pyarrow  # type: ignore[import]
+    import pyarrow.parquet  # type: ignore[import]
+except ImportError:  # pyarrow is only needed for Parquet batches
+    pyarrow = None  # type: ignore[assignment]
+
+# zlib's default level; level 9, gzip's default, is several times slower.
+GZIP_LEVEL = 6
+
+
+@dataclass
+class ParquetEncoding(BaseBatchFileEncoding):
+    """Parquet encoding for batch files."""
+
+    __encoding_format__ = "parquet"
+
+
+class SyncroBatcher(BaseBatcher):
+    """Write records to part files of at most `batch_size` records each.
+
+    Files are named `<prefix><tap>--<stream>-<uuid>-<part>` like the SDK's, and
+    written to the configured storage, local or remote. Each finished file is
+    yielded as a one-file manifest, so a BATCH message can be sent, and state
+    emitted, as soon as it is complete.
+    """
+
+    def get_batches(self, records: t.Iterator[dict]) -> t.Iterator[list[str]]:
+        """Write `records` to files and yield their manifests.
+
+        Args:
+            records: The records to batch.
+
+        Yields:
+            A list holding the URL of a finished file.
+        """
+        sync_id = f"{self.tap_name}--{self.stream_name}-{uuid4()}"
+        prefix = self.batch_config.storage.prefix or ""
+        records = iter(records)
+        for part in itertools.count(1):
+            first = next(records, None)
+            if first is None:
+                return
+            chunk = itertools.chain(
+                (first,), itertools.islice(records, self.batch_config.batch_size - 1)
+            )
+            filename = f"{prefix}{sync_id}-{part}{self.extension}"
+            with self.batch_config.storage.fs(create=True) as filesystem:
+                with filesystem.open(filename, "wb") as file:
+                    self.write(file, chunk)
+                url = filesystem.geturl(filename)
+            yield [url]
+
+    @property
+    def compressed(self) -> bool:
+        """Return whether files are compressed."""
+        return self.batch_config.encoding.compression == "gzip"
+
+    @property
+    @abstractmethod
+    def extension(self) -> str:
+        """Return the file name extension."""
+
+    @abstractmethod
+    def write(self, file: t.IO[bytes], records: t.Iterable[dict]) -> None:
+        """Write records to an open file.
+
+        Args:
+            file: The file, opened for binary writing.
+            records: The records to write.
+        """
+
+
+class JSONLinesBatcher(SyncroBatcher):
+    """Write JSON Lines files, gzipped unless compression is `none`.
+
+    Records are streamed to the file as they are synced, so memory use does not
+    grow with `batch_size`.
+    """
+
+    @property
+    def extension(self) -> str:
+        """Return the file name extension."""
+        return ".json.gz" if self.compressed else ".jsonl"
+
+    def write(self, file: t.IO[bytes], records: t.Iterable[dict]) -> None:
+        """Write records to an open file, one JSON document per line.
+
+        Args:
+            file: The file, opened for binary writing.
+            records: The records to write.
+        """
+        lines = (_json_line(record) for record in records)
+        if self.compressed:
+            with gzip.GzipFile(fileobj=file, mode="wb", compresslevel=GZIP_LEVEL) as gz:
+                gz.writelines(lines)
+        else:
+            file.writelines(lines)
+
+
+class ParquetBatcher(SyncroBatcher):
+    """Write Parquet files, with the column types inferred from each file's records.
+
+    A file's records are held in memory until it is written.
+    """
+
+    @property
+    def extension(self) -> str:
+        """Return the file name extension."""
+        return ".parquet"
+
+    def write(self, file: t.IO[bytes], records: t.Iterable[dict]) -> None:
+        """Write records to an open file as one Parquet table.
+
+        Args:
+            file: The file, opened for binary writing.
+            records: The records to write.
+        """
+        table = pyarrow.Table.from_pylist(list(records))
+        pyarrow.parquet.write_table(
+            table, file, compression="gzip" if self.compressed else "none"
+        )
+
+
+def _json_line(record: dict) -> bytes:
+    """Return a record as one line of JSON, written with orjson when installed.
+
+    Decimals a float cannot hold exactly are written as strings, as the SDK's
+    own batch files write every decimal.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                record, default=json_default, option=orjson.OPT_APPEND_NEWLINE
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return (json.dumps(record, default=_lenient_default) + "\n").encode()
+
+
+def _lenient_default(value: t.Any) -> t.Any:
+    try:
+        return json_default(value)
+    except TypeError:
+        return str(value)
+
+
+def get_batcher(
+    tap_name: str, stream_name: str, batch_config: BatchConfig
+) -> SyncroBatcher:
+    """Return the batcher for the configured file format.
+
+    Args:
+        tap_name: The name of the tap.
+        stream_name: The name of the stream.
+        batch_config: The batch configuration.
+
+    Returns:
+        The batcher.
+
+    Raises:
+        ImportError: If Parquet is requested but pyarrow is not installed.
+    """
+    if batch_config.encoding.format == ParquetEncoding.__encoding_format__:
+        if pyarrow is None:
+            raise ImportError(
+                "Parquet batches require pyarrow: pip install 'tap-syncro[parquet]'"
+            )
+        return ParquetBatcher(tap_name, stream_name, batch_config)
+    return JSONLinesBatcher(tap_name, stream_name, batch_config)
@@ -3,55 +3,222 @@
 from __future__ import annotations
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
-from typing import Any, Callable, Iterable
-from typing import Optional, Any, Generator, Dict, Callable
-import backoff
-import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    cast,
+)
+import asyncio
+import itertools
+import json
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from dateutil import parser as date_parser  # type: ignore[import]
 from backoff.types import Details
 from http import HTTPStatus
+from singer_sdk import metrics
 from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
 
 import requests
 from singer_sdk.authenticators import APIKeyAuthenticator
+from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
 from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.streams import RESTStream
 
+from tap_syncro.batch import get_batcher
+from tap_syncro.fingerprints import FingerprintIndex
+from tap_syncro.instrumentation import StreamMetrics
+from tap_syncro.output import (
+    OUTPUT_LOCK,
+    fast_output_available,
+    orjson,
+    write_record_message,
+)
+from tap_syncro.pagination import PageSizeController
+from tap_syncro.pipeline import BufferedIterator, buffered
+from tap_syncro.rate_limit import RateLimiter
+from tap_syncro.response_cache import ResponseCache
+from tap_syncro.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from typing import Tuple, Union
+
+    from tap_syncro.streams import EmbeddedCustomersStream
+    from tap_syncro.transport import AsyncTransport
+
+    _Page = Tuple[requests.PreparedRequest, requests.Response]
+    # Pages being requested, buffered ahead of their records unless a child's.
+    _Pages = Union[BufferedIterator, Generator[_Page, None, None]]
+
 _Auth = Callable[[requests.PreparedRequest], requests.PreparedRequest]
 SCHEMAS_DIR = Path(__file__).parent / Path("./schemas")
 
 
+class GatewayTimeoutError(FatalAPIError):
+    """A gateway time-out of a page fetched concurrently, which is not retried."""
+
+
+class SyncAbortedError(Exception):
+    """Raised in a stream synced concurrently once another stream failed."""
+
+
 class syncroStream(RESTStream):
     """syncro stream class."""
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.page_size = self.config.get("page_size")
+        # Share the tap's pooled keep-alive session across all streams.
+        self._requests_session = (
+            self._tap.requests_session  # type: ignore[attr-defined]
+        )
+        self._authenticator: APIKeyAuthenticator | None = None
+        self.page_size = self.config.get("page_size") or getattr(
+            type(self), "page_size", None
+        )
+        self._page_size_controller = PageSizeController(
+            self.page_size,
+            maximum=self.config.get("max_page_size") or self.page_size or 25,
+            target_latency=self.config.get("target_request_seconds", 10),
+        )
+        # Records to drop from the start of a page, keyed by context, then page
+        # number and size, when a page size change made the page overlap
+        # records already emitted.
+        self._page_skips: dict[tuple, dict[tuple[int, int | None], int]] = {}
+        # Id of the last record written before a checkpoint, keyed by context,
+        # looked for in the first page of a resumed sync.
+        self._resume_ids: dict[tuple, str] = {}
+        # Compiled from the catalog on first use; see `_compile_projection`.
+        self._deselected_paths: list[tuple[str, ...]] | None = None
+        self._id_paths: list[tuple[str, ...]] = []
+        self.instrumentation = StreamMetrics(self.name)
+        # Page numbers are computed up front when fetching concurrently, so the
+        # page size must not change under them.
+        self._page_size_locked = False
+        # Set while `_request_pages_concurrently` has pages in flight.
+        self._fetching_pages_concurrently = False
+        # Child records requested ahead of their sync, keyed by child context.
+        self._prefetched: dict[tuple, Future] = {}
+        # Child contexts waiting to be synced while their records are fetched.
+        self._pending_children: deque = deque()
+        self._child_executor: ThreadPoolExecutor | None = None
+        self._prefetching_children = False
+        # Backfill windows, computed once per run, and their pages fetched ahead.
+        self._windows: list[dict] | None = None
+        self._window_fetches: dict[tuple, _Pages] = {}
+        self._prefetching_windows = False
+        # The stream this one is derived from in this run, resolved once.
+        self._source_stream: syncroStream | None = None
+        self._source_resolved = False
+        # Whether a source record came without this stream's embedded records.
+        self._derived_incomplete = False
+        self._derived_schema_written = False
+        self._derived_ids: set = set()
 
    
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
+        if self.config.get("api_url"):
+            return self.config["api_url"].rstrip("/")
         return f'https://{self.config.get("subdomain", "demo")}.syncromsp.com/api/v1'
 
     records_jsonpath = "$[*]"  # Or override `parse_response`.
     next_page_token_jsonpath = "$.meta.page"  # Or override `get_next_page_token`.
     max_page_token_jsonpath = "$.meta.total_pages"
+    # Records per page Syncro returns when `per_page` is not sent; updated from
+    # the `meta.per_page` of such responses.
+    api_page_size = 25
     ignore_statuses = [401]
+    # Query param used to filter by `updated_at` server side, when the endpoint has one.
+    updated_since_param: str | None = None
+    # Whether records embed a full `customer` object, see `normalize_customers`.
+    embeds_customer = False
+    # With `derive_embedded_records`, this stream's records are taken from the
+    # `embedded_key` array of `derived_from` records, with `source_id_field` set
+    # to the id of the record they were embedded in. See `source_stream`.
+    derived_from: str | None = None
+    embedded_key: str | None = None
+    source_id_field: str | None = None
 
     @property
     def authenticator(self) -> APIKeyAuthenticator:
-        """Return a new authenticator object.
+        """Return the authenticator object, created once per stream.
 
         Returns:
             An authenticator instance.
         """
-        return APIKeyAuthenticator.create_for_stream(
-            self,
-            key="Authorization",
-            value=self.config.get("auth_token", ""),
-            location="header",
+        if self._authenticator is None:
+            self._authenticator = APIKeyAuthenticator.create_for_stream(
+                self,
+                key="Authorization",
+                value=self.config.get("auth_token", ""),
+                location="header",
+            )
+        return self._authenticator
+
+    @property
+    def timeout(self) -> tuple[float, float]:  # type: ignore[override]
+        """Return the (connect, read) timeouts in seconds."""
+        return (
+            self.config.get("connect_timeout", 10),
+            self.config.get("request_timeout", 300),
         )
 
+    @property
+    def max_concurrency(self) -> int:
+        """Return the number of pages that may be requested at once."""
+        return max(int(self.config.get("max_concurrency") or 1), 1)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Return the rate limiter shared by every stream of the tap."""
+        return self._tap.rate_limiter  # type: ignore[attr-defined]
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Return the retry policy shared by every stream of the tap."""
+        return self._tap.retry_policy  # type: ignore[attr-defined]
+
+    @property
+    def fingerprint_index(self) -> FingerprintIndex | None:
+        """Return the index used to skip unchanged records, if enabled.
+
+        Only streams without a server-side `updated_since_param` use it; the
+        others already receive changed records only.
+        """
+        if self.updated_since_param:
+            return None
+        return self._tap.fingerprint_index  # type: ignore[attr-defined]
+
+    def _fingerprint_generation(self) -> str:
+        """Return the fingerprint generation kept in STATE, starting a new one.
+
+        Without it, a sync from empty STATE would still skip the records the
+        index saw in earlier runs, leaving a reset target without them.
+        """
+        with OUTPUT_LOCK:
+            state = self.stream_state
+            if "fingerprint_generation" not in state:
+                state["fingerprint_generation"] = uuid.uuid4().hex
+            return state["fingerprint_generation"]
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the tap's HTTP response cache, if enabled."""
+        return self._tap.response_cache  # type: ignore[attr-defined]
+
+    @property
+    def async_transport(self) -> AsyncTransport | None:
+        """Return the tap's asyncio transport, or None when using `requests`."""
+        return self._tap.async_transport  # type: ignore[attr-defined]
+
     @property
     def http_headers(self) -> dict:
         """Return the http headers needed.
@@ -64,25 +231,1191 @@ class syncroStream(RESTStream):
         headers["User-Agent"] = self.config.get("user_agent", "hotglue (support@hotglue.xyz)")
         return headers
 
-    def post_process(self, row: dict, context: dict | None = None) -> dict | None:
-        if row.get("id"):
-            row['id'] = str(row['id'])
-        
-        if row.get('customer') and row.get('customer').get('id'):
-            if row['customer'].get('contacts'):
-                for i,r in enumerate(row['customer'].get('contacts')):
-                    row['customer']['contacts'][i]['id'] = str(row['customer']['contacts'][i]['id'])
-            
-            row['customer']['id'] = str(row['customer']['id'])
-        
-
-        if row.get('contacts') and len(row.get("contacts")) > 0:
-            for i,r in enumerate(row.get('contacts')):
-                row['contacts'][i]['id'] = str(row['contacts'][i]['id'])
+    def _compile_projection(self) -> None:
+        """Compile the properties to prune from records and the ids to stringify.
 
+        Done on first use rather than in `__init__`, because the catalog, and
+        with it the selection mask, is applied after streams are created.
+        Unselected streams that are synced for their children keep everything.
+        """
+        deselected = (
+            compile_deselected_paths(self.schema, self.mask) if self.selected else []
+        )
+        self._id_paths = [
+            path
+            for path in compile_id_paths(self.schema)
+            if not any(path[: len(pruned)] == pruned for pruned in deselected)
+        ]
+        self._deselected_paths = deselected
+
+    def prune(self, row: dict) -> dict:
+        """Remove the properties deselected in the catalog from a record, in place.
+
+        The SDK drops them too, but only when writing the record; pruning them
+        as soon as the record is extracted spares post-processing them.
+        """
+        if self._deselected_paths is None:
+            self._compile_projection()
+        for path in self._deselected_paths or ():
+            _pop_path(row, path)
+        return row
 
+    def post_process(self, row: dict, context: dict | None = None) -> dict | None:
+        if self._deselected_paths is None:
+            self._compile_projection()
+        # Ids typed as strings in the schema arrive as integers from the API.
+        for path in self._id_paths:
+            _stringify_path(row, path)
         return row
 
+    # Streams may sync concurrently, so state updates and message writes are
+    # serialized through OUTPUT_LOCK.
+
+    @property
+    def stream_state(self) -> dict:
+        """Return the writable state for this stream."""
+        with OUTPUT_LOCK:
+            return super().stream_state
+
+    def get_context_state(self, context: dict | None) -> dict:
+        """Return the writable state for the given context."""
+        with OUTPUT_LOCK:
+            return super().get_context_state(context)
+
+    def _increment_stream_state(
+        self, latest_record: dict[str, Any], *, context: dict | None = None
+    ) -> None:
+        with OUTPUT_LOCK:
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _write_starting_replication_value(self, context: dict | None) -> None:
+        with OUTPUT_LOCK:
+            super()._write_starting_replication_value(context)
+
+    def _write_replication_key_signpost(self, context: dict | None, value: Any) -> None:
+        with OUTPUT_LOCK:
+            super()._write_replication_key_signpost(context, value)
+
+    def reset_state_progress_markers(self, state: dict | None = None) -> None:
+        with OUTPUT_LOCK:
+            super().reset_state_progress_markers(state)
+
+    def _finalize_state(self, state: dict | None = None) -> None:
+        with OUTPUT_LOCK:
+            super()._finalize_state(state)
+
+    def finalize_state_progress_markers(self, state: dict | None = None) -> None:
+        with OUTPUT_LOCK:
+            super().finalize_state_progress_markers(state)
+
+    def _write_state_message(self) -> None:
+        with OUTPUT_LOCK:
+            super()._write_state_message()
+
+    def _write_schema_message(self) -> None:
+        with OUTPUT_LOCK:
+            super()._write_schema_message()
+
+    def _write_batch_message(
+        self, encoding: BaseBatchFileEncoding, manifest: list[str]
+    ) -> None:
+        with OUTPUT_LOCK:
+            super()._write_batch_message(encoding, manifest)
+
+    def _write_record_message(self, record: dict) -> None:
+        with OUTPUT_LOCK, self.instrumentation.time("output"):
+            if not self.config.get("fast_output", False) or not fast_output_available():
+                super()._write_record_message(record)
+                return
+            for record_message in self._generate_record_messages(record):
+                write_record_message(record_message)
+            self._is_state_flushed = False
+
+    def log_instrumentation(self) -> None:
+        """Log this stream's instrumentation as Singer METRIC messages.
+
+        Throughput is logged as a plain message, as Singer has no gauge metric.
+        """
+        if not self.instrumentation.requests:
+            return
+        for point in self.instrumentation.metric_points():
+            self.metrics_logger.info("METRIC: %s", json.dumps(point))
+        records_per_second = self.instrumentation.summary()["records_per_second"]
+        if records_per_second is not None:
+            self.logger.info(
+                "Stream %s wrote %s records per second", self.name, records_per_second
+            )
+
+    def get_updated_since(self, context: dict | None) -> datetime | None:
+        """Return the lower `updated_at` bound for this sync, if any.
+
+        Args:
+            context: The stream context.
+
+        Returns:
+            The later of the state bookmark and `start_date`, or of the window's
+            bookmark and start for backfill windows, or None.
+        """
+        if not self.replication_key:
+            return None
+        if context and "window_start" in context:
+            candidates = [
+                self.get_starting_replication_key_value(context),
+                # A bookmark from before the stream was windowed still applies.
+                self.stream_state.get("replication_key_value"),
+                context["window_start"],
+            ]
+        else:
+            candidates = [
+                self.get_starting_replication_key_value(context),
+                self.config.get("start_date"),
+            ]
+        parsed = [parse_datetime(value) for value in candidates if value]
+        return max(parsed) if parsed else None
+
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Return the backfill windows of the stream, or the SDK's partitions.
+
+        With `backfill_window_days`, streams Syncro can filter by `updated_at`
+        are split into windows starting every `backfill_window_days` from
+        `start_date`, the last one open-ended. Each window is a partition with
+        its own bookmark, and up to `max_concurrency` windows are fetched at once.
+
+        Syncro filters by `updated_at` from a start only, so a window asks for
+        the records since its start, sorted by `updated_at`, and stops paging
+        once a page reaches its end. Should a page arrive out of that order, the
+        window pages through every record since its start instead, and keeps
+        those before its end.
+        """
+        if self._windows is None:
+            self._windows = self._backfill_windows()
+        return self._windows or super().partitions
+
+    def _backfill_windows(self) -> list[dict]:
+        days = self.config.get("backfill_window_days")
+        start_date = self.config.get("start_date")
+        if not days or not start_date or not self.updated_since_param:
+            return []
+        if self.parent_stream_type:
+            return []
+        start = parse_datetime(start_date)
+        now = datetime.now(timezone.utc)
+        windows: list[dict] = []
+        while not windows or start < now:
+            windows.append({"window_start": start.isoformat()})
+            start += timedelta(days=days)
+        return windows
+
+    def _window_end(self, context: dict | None) -> datetime | None:
+        """Return the end of a backfill window, or None if it is open-ended."""
+        if not context or "window_start" not in context:
+            return None
+        windows = self.partitions or []
+        for window, next_window in zip(windows, windows[1:]):
+            if window == context:
+                return parse_datetime(next_window["window_start"])
+        return None
+
+    def _prefetch_windows(self, context: dict | None) -> None:
+        """Start fetching `context` and the windows after it, `max_concurrency` at once.
+
+        Concurrent windows share the stream's page size, so it is locked.
+        """
+        windows = self.partitions or []
+        if context not in windows:
+            return
+        index = windows.index(context)
+        if self.max_concurrency > 1:
+            self._prefetching_windows = True
+            self._page_size_locked = True
+        for window in windows[index : index + self.max_concurrency]:
+            key = _context_key(window)
+            if key in self._window_fetches or self._window_complete(window):
+                continue
+            self._window_fetches[key] = self._fetch_pages(window)
+
+    def _window_complete(self, context: dict | None) -> bool:
+        """Return whether a closed window was fully synced by an earlier run.
+
+        Records only ever move to later windows when updated, so a synced window
+        whose end has passed has nothing left to fetch.
+        """
+        return bool(self.get_context_state(context).get("window_complete"))
+
+    def _close_window_fetches(self) -> None:
+        for fetch in self._window_fetches.values():
+            fetch.close()
+        self._window_fetches.clear()
+        if self._prefetching_windows:
+            # Child streams are locked by their parent instead; see `_sync_children`.
+            self._prefetching_windows = False
+            self._page_size_locked = False
+
+    @property
+    def source_stream(self) -> syncroStream | None:
+        """Return the stream whose records embed this stream's, when deriving them.
+
+        Records are derived when the source stream is selected, and either this
+        stream has no endpoint of its own, or `derive_embedded_records` is set
+        and the source has no bookmark yet. An incremental source sync only sees
+        records updated since its bookmark, which an embedded record may have
+        changed without, so the stream's own endpoint is paged instead. A
+        `start_date` alone does not prevent deriving, as it bounds this stream's
+        own endpoint as well.
+
+        Resolved when the source starts syncing, before its bookmark moves.
+        """
+        if not self._source_resolved:
+            self._source_stream = self._resolve_source_stream()
+            self._source_resolved = True
+        return self._source_stream
+
+    def _resolve_source_stream(self) -> syncroStream | None:
+        if not self.derived_from:
+            return None
+        source = cast("syncroStream | None", self._tap.streams.get(self.derived_from))
+        if source is None or not source.selected:
+            return None
+        if not getattr(self, "path", None):
+            return source
+        if not self.config.get("derive_embedded_records"):
+            return None
+        if source.has_bookmark():
+            return None
+        return source
+
+    def has_bookmark(self) -> bool:
+        """Return whether the stream's state holds a bookmark of an earlier sync."""
+        state = self.stream_state
+        return any(
+            bookmark.get("replication_key_value")
+            for bookmark in (state, *state.get("partitions", []))
+        )
+
+    def _derived_all_records(self) -> bool:
+        """Return whether no records are left to request once the source synced."""
+        source = self.source_stream
+        has_endpoint = bool(getattr(self, "path", None))
+        if source is None:
+            if self.derived_from and not has_endpoint:
+                self.logger.warning(
+                    f"'{self.name}' is only written while syncing "
+                    f"'{self.derived_from}', which is not selected"
+                )
+                return True
+            return False
+        if not self._derived_incomplete:
+            self.logger.info(f"'{self.name}' was derived from '{source.name}'")
+            return True
+        if not has_endpoint:
+            self.logger.warning(
+                f"Some '{source.name}' records did not embed '{self.embedded_key}'"
+            )
+            return True
+        self.logger.warning(
+            f"Some '{source.name}' records did not embed '{self.embedded_key}'; "
+            f"syncing '{self.name}' from its own endpoint"
+        )
+        return False
+
+    def _derived_streams(self) -> list[syncroStream]:
+        """Return the selected streams derived from this stream's records."""
+        return [
+            stream
+            for stream in self._tap.streams.values()  # type: ignore[attr-defined]
+            if stream.selected
+            and isinstance(stream, syncroStream)
+            and stream.source_stream is self
+        ]
+
+    def write_derived(self, items: list[dict], source_id: Any) -> None:
+        """Write records embedded in a record of the source stream.
+
+        Records are written once per run: several source records may embed the
+        same one, and a source record may be synced twice while it changes.
+        The stream's bookmark advances as they are written, so its next
+        incremental sync starts from there.
+
+        Args:
+            items: The embedded records.
+            source_id: The id of the record they were embedded in.
+        """
+        with OUTPUT_LOCK:
+            if not self._derived_schema_written:
+                self._write_schema_message()
+                self._derived_schema_written = True
+            for item in items:
+                item_id = item.get("id")
+                if item_id is not None:
+                    if item_id in self._derived_ids:
+                        continue
+                    self._derived_ids.add(item_id)
+                # Copied, as the source record may still hold the same objects.
+                record = dict(item)
+                if self.source_id_field and record.get(self.source_id_field) is None:
+                    record[self.source_id_field] = source_id
+                with self.instrumentation.time("post_process"):
+                    processed = self.post_process(self.prune(record))
+                if processed is not None:
+                    self._write_record_message(processed)
+                    if self.replication_key and record.get(self.replication_key):
+                        self._increment_stream_state(record)
+                    self.instrumentation.observe_records()
+
+    def get_records(self, context: dict | None) -> Iterable[dict]:
+        """Return processed records, dropping rows not updated since the bookmark.
+
+        Endpoints without `updated_since_param` return their full history, so rows
+        older than the bookmark are filtered out here instead, as are rows past
+        the end of a backfill window. Child streams are synced once every record
+        has been yielded, see `_sync_children`.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            One item per record updated since the last sync.
+        """
+        updated_since = self.get_updated_since(context)
+        window_end = self._window_end(context)
+        if self._nothing_to_sync(context, updated_since, window_end):
+            return
+        if window_end or (context and "window_start" in context):
+            self._prefetch_windows(context)
+        # The SDK only bookmarks selected streams. When only children are
+        # selected, keep the bookmark moving anyway so that the next sync fetches
+        # children of changed parents only.
+        track_state = (
+            not self.selected and self.has_selected_descendents and self.replication_key
+        )
+        embedded_customers = self._embedded_customers_stream()
+        derived_streams = self._derived_streams()
+        fingerprints = self.fingerprint_index
+        if fingerprints is not None:
+            fingerprints.start(self.name, self._fingerprint_generation())
+        prefetched = self._prefetched.pop(_context_key(context), None)
+        records = (
+            prefetched.result()
+            if prefetched is not None
+            else self.request_records(context)
+        )
+        completed = False
+        try:
+            for record in records:
+                # Taken out before post_process so that it is processed only once
+                # per distinct customer, by the embedded_customers stream.
+                customer = record.pop("customer", None) if embedded_customers else None
+                source_id = record.get("id")
+                embedded = self._take_embedded(record, derived_streams)
+                with self.instrumentation.time("post_process"):
+                    record = self.post_process(self.prune(record), context)
+                if (
+                    record is None
+                    or self._out_of_range(record, updated_since, window_end)
+                    or self._unchanged(fingerprints, record, customer, embedded)
+                ):
+                    continue
+                self._write_embedded(
+                    record, source_id, customer, embedded_customers, embedded
+                )
+                self.instrumentation.observe_records()
+                if track_state:
+                    self._increment_stream_state(record, context=context)
+                yield record
+            self._finish_records(context, fingerprints, window_end)
+            completed = True
+        finally:
+            self._close_children()
+            if not completed or not self._window_fetches:
+                self._close_window_fetches()
+
+    def _nothing_to_sync(
+        self,
+        context: dict | None,
+        updated_since: datetime | None,
+        window_end: datetime | None,
+    ) -> bool:
+        """Return whether a derived stream or a backfill window is already synced."""
+        if self.derived_from and self._derived_all_records():
+            return True
+        if not window_end:
+            return False
+        return self._window_complete(context) or bool(
+            updated_since and updated_since >= window_end
+        )
+
+    def _embedded_customers_stream(self) -> EmbeddedCustomersStream | None:
+        """Return the stream to write embedded customers to, when normalizing them."""
+        if not self.embeds_customer or not self.config.get("normalize_customers"):
+            return None
+        return cast(
+            "EmbeddedCustomersStream | None",
+            self._tap.streams.get("embedded_customers"),
+        )
+
+    def _take_embedded(
+        self, record: dict, derived_streams: list[syncroStream]
+    ) -> dict[syncroStream, list]:
+        """Return the records of derived streams embedded in a source record.
+
+        Arrays that are not part of this stream's schema are taken out of the
+        record, so they are not processed with it.
+        """
+        embedded = {}
+        properties = self.schema["properties"]
+        for stream in derived_streams:
+            key = stream.embedded_key
+            if key not in record:
+                stream._derived_incomplete = True
+            elif key in properties:
+                embedded[stream] = record[key] or []
+            else:
+                embedded[stream] = record.pop(key) or []
+        return embedded
+
+    def _write_embedded(
+        self,
+        record: dict,
+        source_id: Any,
+        customer: dict | None,
+        embedded_customers: EmbeddedCustomersStream | None,
+        embedded: dict[syncroStream, list],
+    ) -> None:
+        """Write the customer and derived records taken out of a source record."""
+        if customer and embedded_customers:
+            if record.get("customer_id") is None:
+                record["customer_id"] = customer.get("id")
+            embedded_customers.write_customer(customer)
+        for stream, items in embedded.items():
+            stream.write_derived(items, source_id)
+
+    def _out_of_range(
+        self, record: dict, updated_since: datetime | None, window_end: datetime | None
+    ) -> bool:
+        """Return whether a record predates the bookmark or is past its window."""
+        if not (updated_since or window_end) or not record.get(self.replication_key):
+            return False
+        updated_at = parse_datetime(record[self.replication_key])
+        if updated_since and updated_at < updated_since:
+            return True
+        return bool(window_end and updated_at >= window_end)
+
+    def _unchanged(
+        self,
+        fingerprints: FingerprintIndex | None,
+        record: dict,
+        customer: dict | None,
+        embedded: dict[syncroStream, list],
+    ) -> bool:
+        """Return whether the fingerprint index already saw a record as it is.
+
+        The customer and derived records taken out of it count as its content.
+        """
+        if fingerprints is None or record.get("id") is None:
+            return False
+        content = dict(record) if customer or embedded else record
+        if customer:
+            content["customer"] = customer
+        for stream, items in embedded.items():
+            content[stream.embedded_key] = items
+        return not fingerprints.changed(self.name, record["id"], content)
+
+    def _finish_records(
+        self,
+        context: dict | None,
+        fingerprints: FingerprintIndex | None,
+        window_end: datetime | None,
+    ) -> None:
+        """Sync the pending children, then record that `context` is complete."""
+        self._drain_children()
+        if fingerprints is not None:
+            fingerprints.commit(self.name)
+        if window_end:
+            with OUTPUT_LOCK:
+                self.get_context_state(context)["window_complete"] = True
+
+    def get_batch_config(self, config: Mapping) -> BatchConfig | None:
+        """Return the batch config, unless this is a child stream.
+
+        Child streams sync once per parent record, and would write a file for
+        each; they keep emitting RECORD messages instead.
+        """
+        if self.parent_stream_type:
+            return None
+        return super().get_batch_config(config)
+
+    def get_batches(
+        self, batch_config: BatchConfig, context: dict | None = None
+    ) -> Iterable[tuple[BaseBatchFileEncoding, list[str]]]:
+        """Write the records of `context` to batch files, yielding each manifest."""
+        batcher = get_batcher(self.tap_name, self.name, batch_config)
+        records = self._sync_records(context, write_messages=False)
+        for manifest in batcher.get_batches(records):
+            yield batch_config.encoding, manifest
+
+    def prefetch_records(
+        self, context: dict, executor: ThreadPoolExecutor | None
+    ) -> None:
+        """Start requesting the records of `context` ahead of its sync.
+
+        Args:
+            context: The stream context.
+            executor: The pool to request the records on, or None to request them
+                as a coroutine on the async transport.
+        """
+        transport = self.async_transport
+        if executor is not None:
+            future = executor.submit(lambda: list(self.request_records(context)))
+        elif transport is not None:
+            future = transport.submit(self._request_records_async(context))
+        else:
+            raise ValueError("Records are prefetched on a pool or the async transport")
+        self._prefetched[_context_key(context)] = future
+
+    async def _request_records_async(self, context: dict | None) -> list[dict]:
+        """Request every page of `context` on the async transport.
+
+        Args:
+            context: The stream context.
+
+        Returns:
+            The records of every page.
+        """
+        decorated_request = self.request_decorator(self._request_async)
+        records: list[dict] = []
+        next_page_token = None
+        self._page_skips[_context_key(context)] = {}
+        try:
+            while True:
+                prepared_request = self.prepare_request(
+                    context, next_page_token=next_page_token
+                )
+                response = await decorated_request(prepared_request, context)
+                self.update_sync_costs(prepared_request, response, context)
+                skip = self._pop_page_skip(context, prepared_request)
+                page_records = self.parse_response(response)
+                records.extend(itertools.islice(page_records, skip, None))
+                next_page_token = self._next_page(context, response, next_page_token)
+                if not next_page_token:
+                    return records
+        finally:
+            self._page_skips.pop(_context_key(context), None)
+
+    def _sync_children(self, child_context: dict | None) -> None:
+        """Sync child streams, fetching up to `max_concurrency` parents at a time.
+
+        Instead of syncing children as each parent record is processed, their
+        records are requested in a thread pool, or on the async transport, and
+        the child syncs are deferred until a window of `2 * max_concurrency`
+        parents is full, so writes stay in parent order while requests overlap.
+        """
+        children = [
+            child
+            for child in self._syncro_children
+            if child.selected or child.has_selected_descendents
+        ]
+        if child_context is None or not children or self.max_concurrency <= 1:
+            super()._sync_children(child_context)
+            return
+
+        if not self._prefetching_children:
+            self._prefetching_children = True
+            if self.async_transport is None:
+                self._child_executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix=f"{self.name}-children",
+                )
+            for child in children:
+                # Concurrent contexts share the child's page size.
+                child._page_size_locked = True
+        for child in children:
+            child.prefetch_records(child_context, self._child_executor)
+        self._pending_children.append(child_context)
+        while len(self._pending_children) > 2 * self.max_concurrency:
+            super()._sync_children(self._pending_children.popleft())
+
+    @property
+    def _syncro_children(self) -> list[syncroStream]:
+        return cast("list[syncroStream]", self.child_streams)
+
+    def _drain_children(self) -> None:
+        """Sync the child contexts still waiting on their prefetched records."""
+        while self._pending_children:
+            super()._sync_children(self._pending_children.popleft())
+
+    def _close_children(self) -> None:
+        """Cancel outstanding child fetches and release the child pool."""
+        if not self._prefetching_children:
+            return
+        self._pending_children.clear()
+        for child in self._syncro_children:
+            for future in child._prefetched.values():
+                future.cancel()
+            child._prefetched.clear()
+            child._page_size_locked = False
+        if self._child_executor is not None:
+            self._child_executor.shutdown(wait=True)
+            self._child_executor = None
+        self._prefetching_children = False
+
+    def request_records(self, context: dict | None) -> Iterable[dict]:
+        """Request records from the endpoint, following pagination.
+
+        Pages are fetched in a background thread, ahead of the records being
+        written, up to `max_buffered_records` and `max_buffered_bytes`; beyond
+        that, fetching waits for the target to catch up.
+
+        Args:
+            context: The stream context.
+
+        Yields:
+            An item for every record in the response.
+        """
+        interval = self.checkpoint_interval
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+
+            responses = self._window_fetches.pop(_context_key(context), None)
+            if responses is None:
+                responses = self._fetch_pages(context)
+            try:
+                yield from self._records_from_pages(
+                    context, responses, request_counter, interval
+                )
+            finally:
+                responses.close()
+                self._page_skips.pop(_context_key(context), None)
+
+        if interval:
+            with OUTPUT_LOCK:
+                self.get_context_state(context).pop("checkpoint", None)
+
+    def _fetch_pages(self, context: dict | None) -> _Pages:
+        """Start requesting the pages of `context`."""
+        decorated_request = self.request_decorator(self._request)
+        responses = self.request_pages(context, decorated_request)
+        window_end = self._window_end(context)
+        if window_end is not None:
+            responses = self._until_window_end(responses, window_end)
+        if self.parent_stream_type:
+            # Child contexts are small and already fetched ahead by the parent.
+            return responses
+        return buffered(
+            responses,
+            self._weigh_page,
+            max_records=self.config.get("max_buffered_records", 5000),
+            max_bytes=self.config.get("max_buffered_bytes", 64 * 2**20),
+            name=f"{self.name}-fetch",
+        )
+
+    def _until_window_end(
+        self,
+        pages: Iterable[_Page],
+        window_end: datetime,
+    ) -> Generator[_Page, None, None]:
+        """Yield the pages of a backfill window, up to the one reaching its end.
+
+        Only while pages arrive sorted by `updated_at`, as requested; after one
+        that is not, every page is yielded.
+        """
+        latest = None
+        pages = iter(pages)
+        try:
+            for prepared_request, response in pages:
+                # Read before the page is handed over to be post-processed.
+                values = [
+                    parse_datetime(record[self.replication_key])
+                    for record in self.parse_response(response)
+                    if record.get(self.replication_key)
+                ]
+                in_order = values == sorted(values) and not (
+                    latest and values and values[0] < latest
+                )
+                yield prepared_request, response
+                if not in_order:
+                    self.logger.warning(
+                        f"'{self.name}' records are not sorted by "
+                        f"{self.replication_key}; paging past the window end"
+                    )
+                    yield from pages
+                    return
+                latest = values[-1] if values else latest
+                if latest and latest >= window_end:
+                    return
+        finally:
+            close = getattr(pages, "close", None)
+            if close:
+                close()
+
+    def _records_from_pages(
+        self,
+        context: dict | None,
+        responses: Iterator[tuple[requests.PreparedRequest, requests.Response]],
+        request_counter: metrics.Counter,
+        interval: int,
+    ) -> Iterable[dict]:
+        """Yield the records of fetched pages, writing a checkpoint every `interval`."""
+        pages = 0
+        for prepared_request, response in responses:
+            request_counter.increment()
+            self.update_sync_costs(prepared_request, response, context)
+            skip = self._pop_page_skip(context, prepared_request)
+            records: Iterable[dict] = self.parse_response(response)
+            resume_id = self._resume_ids.pop(_context_key(context), None)
+            if resume_id is not None:
+                records = list(records)
+                skip = self._realign_resume(records, skip, resume_id)
+            record_count = 0
+            last_record = None
+            for index, record in enumerate(records):
+                record_count += 1
+                if index >= skip:
+                    last_record = record
+                    yield record
+
+            # Every record of the page has been written once control is back.
+            pages += 1
+            if interval and pages % interval == 0:
+                # Children of the page's records must be synced before the
+                # checkpoint, or a failed run would resume without them.
+                self._drain_children()
+                self._write_checkpoint(
+                    context, prepared_request, record_count, last_record
+                )
+
+    def _weigh_page(
+        self, page: tuple[requests.PreparedRequest, requests.Response]
+    ) -> tuple[int, int]:
+        """Return the records and bytes held by a fetched page."""
+        response = page[1]
+        return sum(1 for _ in self.parse_response(response)), len(response.content)
+
+    @property
+    def checkpoint_interval(self) -> int:
+        """Return how many pages to sync between checkpoints, or 0 to disable."""
+        if self.parent_stream_type:
+            # Child contexts are short; their state is not worth checkpointing.
+            return 0
+        if self.get_batch_config(self.config):
+            # Records of a checkpointed page may still sit in an unfinished file;
+            # state is written after each finished file instead.
+            return 0
+        return int(self.config.get("checkpoint_interval_pages", 50) or 0)
+
+    def _write_checkpoint(
+        self,
+        context: dict | None,
+        prepared_request: requests.PreparedRequest,
+        record_count: int,
+        last_record: dict | None,
+    ) -> None:
+        """Record the next page to request in STATE and emit it."""
+        per_page = _query_int(prepared_request, "per_page")
+        if per_page and record_count < per_page:
+            # A short page is the last one; nothing is left to resume.
+            return
+        updated_since = self.get_updated_since(context)
+        checkpoint = {
+            "page": (_query_int(prepared_request, "page") or 1) + 1,
+            "per_page": per_page,
+            "updated_since": updated_since.isoformat() if updated_since else None,
+        }
+        if last_record and last_record.get("id") is not None:
+            checkpoint["last_id"] = last_record["id"]
+        with OUTPUT_LOCK:
+            self.get_context_state(context)["checkpoint"] = checkpoint
+            self._is_state_flushed = False
+            self._write_state_message()
+
+    def _resume_page(self, context: dict | None) -> int | None:
+        """Return the page to resume from, per a checkpoint left by a failed run."""
+        checkpoint = self.get_context_state(context).get("checkpoint")
+        if not checkpoint or not self.checkpoint_interval:
+            return None
+        updated_since = self.get_updated_since(context)
+        if checkpoint.get("updated_since") != (
+            updated_since.isoformat() if updated_since else None
+        ):
+            return None
+
+        page, per_page = checkpoint["page"], checkpoint.get("per_page")
+        self.logger.info(f"Resuming '{self.name}' from checkpoint at page {page}")
+        if checkpoint.get("last_id") is not None and per_page and self.page_size:
+            # Start from the last record written, to find where it moved to if
+            # records before it changed since; see `_realign_resume`.
+            self._resume_ids[_context_key(context)] = str(checkpoint["last_id"])
+            return self._rebase_page(context, (page - 1) * per_page - 1)
+        if per_page == self.page_size:
+            return page
+        if not per_page or not self.page_size:
+            return None
+        return self._rebase_page(context, (page - 1) * per_page)
+
+    def _realign_resume(self, records: list[dict], skip: int, resume_id: str) -> int:
+        """Return how many records of the first resumed page were already written.
+
+        The last record written before the checkpoint is expected at `skip`.
+        Records updated since move to the end of the sort order, which shifts it
+        back, so the page is searched for it instead.
+
+        Args:
+            records: The records of the first page requested.
+            skip: The index the last record written is expected at.
+            resume_id: The id of the last record written.
+
+        Returns:
+            The number of records to skip.
+        """
+        ids = [str(record.get("id")) for record in records]
+        if resume_id in ids:
+            return ids.index(resume_id) + 1
+        self.logger.warning(
+            f"Record {resume_id} of the '{self.name}' checkpoint moved out of the "
+            "resumed page; writing the page in full"
+        )
+        return 0
+
+    def request_pages(
+        self,
+        context: dict | None,
+        decorated_request: Callable[..., requests.Response],
+    ) -> Generator[_Page, None, None]:
+        """Request every page of the endpoint, in page order.
+
+        Once the first page reports `total_pages`, the remaining pages are fetched
+        concurrently when `max_concurrency` is above one. Child streams and
+        backfill windows run their contexts concurrently instead, see
+        `_sync_children` and `partitions`.
+
+        Args:
+            context: The stream context.
+            decorated_request: The request callable wrapped with retry handling.
+
+        Yields:
+            Each prepared request with its response.
+        """
+        self._page_skips[_context_key(context)] = {}
+        next_page_token = self._resume_page(context)
+        concurrent = (
+            self.max_concurrency > 1
+            and not self.parent_stream_type
+            and "window_start" not in (context or {})
+        )
+        while True:
+            prepared_request = self.prepare_request(
+                context,
+                next_page_token=next_page_token,
+            )
+            response = decorated_request(prepared_request, context)
+            yield prepared_request, response
+
+            if concurrent:
+                concurrent = False
+                next_page_token = yield from self._request_pages_concurrently(
+                    context, decorated_request, response
+                )
+            else:
+                next_page_token = self._next_page(context, response, next_page_token)
+            if not next_page_token:
+                return
+
+    def _request_pages_concurrently(
+        self,
+        context: dict | None,
+        decorated_request: Callable[..., requests.Response],
+        first_response: requests.Response,
+    ) -> Generator[
+        tuple[requests.PreparedRequest, requests.Response], None, int | None
+    ]:
+        """Fetch the pages after `first_response` through a bounded thread pool.
+
+        At most `max_concurrency` pages are in flight at once, and responses are
+        yielded in page order so output stays deterministic. With the async
+        transport, pages are requested as coroutines rather than on threads.
+
+        A gateway time-out cancels the pages still pending, since they were
+        numbered for a page size the API cannot serve.
+
+        Returns:
+            The page to continue from serially after a gateway time-out, at a
+            smaller page size, or None once every page was fetched.
+        """
+        pages = self._remaining_pages(first_response)
+        if pages is None:
+            return None
+
+        pending: deque = deque()
+        self._page_size_locked = True
+        self._fetching_pages_concurrently = True
+        submit, executor = self._page_fetcher(context, decorated_request)
+        timed_out = None
+        try:
+            for page in itertools.islice(pages, self.max_concurrency):
+                pending.append(submit(page))
+            while pending:
+                prepared_request, future = pending.popleft()
+                try:
+                    response = future.result()
+                except GatewayTimeoutError:
+                    timed_out = prepared_request
+                    break
+                if not self._has_records(response):
+                    break
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append(submit(next_page))
+                yield prepared_request, response
+        finally:
+            for _, future in pending:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=True)
+            self._fetching_pages_concurrently = False
+            self._page_size_locked = False
+        if timed_out is None:
+            return None
+        return self._resume_serially(context, timed_out)
+
+    def _page_fetcher(
+        self,
+        context: dict | None,
+        decorated_request: Callable[..., requests.Response],
+    ) -> tuple[
+        Callable[[int], tuple[requests.PreparedRequest, Future]],
+        ThreadPoolExecutor | None,
+    ]:
+        """Return a function starting the request of a page, and its thread pool.
+
+        With the async transport, pages are requested as coroutines and there is
+        no pool to shut down.
+        """
+        transport = self.async_transport
+        if transport is not None:
+            decorated_async_request = self.request_decorator(self._request_async)
+
+            def submit_coroutine(page: int) -> tuple[requests.PreparedRequest, Future]:
+                prepared_request = self.prepare_request(context, next_page_token=page)
+                future = transport.submit(
+                    decorated_async_request(prepared_request, context)
+                )
+                return prepared_request, future
+
+            return submit_coroutine, None
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=f"{self.name}-pages",
+        )
+
+        def submit(page: int) -> tuple[requests.PreparedRequest, Future]:
+            prepared_request = self.prepare_request(context, next_page_token=page)
+            future = executor.submit(decorated_request, prepared_request, context)
+            return prepared_request, future
+
+        return submit, executor
+
+    def _remaining_pages(
+        self, first_response: requests.Response
+    ) -> Iterator[int] | None:
+        """Return the page numbers after `first_response`, if it reports a total."""
+        document = self.decode_response(first_response)
+        current_page = next(
+            iter(extract_jsonpath(self.next_page_token_jsonpath, document)), None
+        )
+        total_pages = next(
+            iter(extract_jsonpath(self.max_page_token_jsonpath, document)), None
+        )
+        if not current_page or not total_pages or not self._has_records(first_response):
+            return None
+        return iter(range(int(current_page) + 1, int(total_pages) + 1))
+
+    def _resume_serially(
+        self, context: dict | None, timed_out: requests.PreparedRequest
+    ) -> int:
+        """Halve the page size and return the page holding a timed-out request's.
+
+        Args:
+            context: The stream context.
+            timed_out: The concurrent page request that timed out.
+
+        Returns:
+            The page to continue from, at the new page size.
+        """
+        page, per_page = _page_key(timed_out)
+        if not self.page_size or self.page_size > 1:
+            self.page_size = self._page_size_controller.decrease()
+            self.instrumentation.observe_page_size(self.page_size)
+            self.logger.warning(f"Decreasing page size to {self.page_size}")
+        self.logger.warning(f"Fetching pages of {self.name} serially from page {page}")
+        return self._rebase_page(context, (page - 1) * (per_page or self.api_page_size))
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        self._check_not_aborted()
+        response = self._cached_response(prepared_request)
+        if response is not None:
+            return response
+        transport = self.async_transport
+        if transport is not None:
+            return transport.run(self._request_async(prepared_request, context))
+        self.rate_limiter.acquire()
+        response = super()._request(prepared_request, context)
+        self._observe_success(response)
+        self._cache_response(prepared_request, response)
+        return response
+
+    async def _request_async(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a request on the async transport, like `_request` does.
+
+        Wrap it with `request_decorator` for the usual retry policy; backoff
+        awaits between attempts instead of sleeping.
+        """
+        self._check_not_aborted()
+        response = self._cached_response(prepared_request)
+        if response is not None:
+            return response
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        response = await cast("AsyncTransport", self.async_transport).send(
+            prepared_request, timeout=self.timeout
+        )
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        self.validate_response(response)
+        self._observe_success(response)
+        self._cache_response(prepared_request, response)
+        return response
+
+    def _check_not_aborted(self) -> None:
+        """Stop a stream synced concurrently once another stream has failed.
+
+        Raises:
+            SyncAbortedError: If the tap aborted the sync; it is not retried.
+        """
+        if self._tap.sync_aborted.is_set():  # type: ignore[attr-defined]
+            raise SyncAbortedError(
+                f"Stopped syncing {self.name} after another stream failed"
+            )
+
+    def _cached_response(
+        self, prepared_request: requests.PreparedRequest
+    ) -> requests.Response | None:
+        """Return the cached response to a request, when the cache has one.
+
+        Raises:
+            FatalAPIError: In replay mode, if the request was not recorded.
+        """
+        cache = self.response_cache
+        if cache is None:
+            return None
+        response = cache.get(prepared_request)
+        if response is not None:
+            # Replayed timings drive page sizes as in the recorded run.
+            self._observe_success(response)
+        elif cache.replay:
+            raise FatalAPIError(
+                f"No recorded response for {prepared_request.url}. Replays must "
+                "use the config and state of the recorded run"
+            )
+        return response
+
+    def _cache_response(
+        self, prepared_request: requests.PreparedRequest, response: requests.Response
+    ) -> None:
+        if self.response_cache is not None:
+            self.response_cache.put(prepared_request, response)
+
+    def _observe_success(self, response: requests.Response) -> None:
+        """Grow the page size when requests complete well under the target."""
+        if not self._page_size_locked and self._page_size_controller.record_success(
+            response.elapsed.total_seconds()
+        ):
+            self.page_size = self._page_size_controller.size
+            self.instrumentation.observe_page_size(self.page_size)
+            self.logger.info(f"Increasing page size to {self.page_size}")
+
+    def _rebase_page(self, context: dict | None, offset: int) -> int:
+        """Return the page holding record `offset` at the current page size.
+
+        Records of that page before `offset` were already emitted and are skipped.
+        """
+        page = offset // self.page_size + 1
+        skips = self._page_skips.setdefault(_context_key(context), {})
+        skips[(page, self.page_size)] = offset % self.page_size
+        return page
+
+    def _pop_page_skip(
+        self, context: dict | None, request: requests.PreparedRequest
+    ) -> int:
+        """Return, and forget, the records to skip from the page of a request."""
+        skips = self._page_skips.get(_context_key(context), {})
+        return skips.pop(_page_key(request), 0)
+
+    def _next_page(
+        self, context: dict | None, response: requests.Response, previous_token: Any
+    ) -> Any | None:
+        """Return the next page to request, rebased if the page size changed."""
+        next_page_token = self.get_next_page_token(response, previous_token)
+        per_page = _query_int(response.request, "per_page")
+        if next_page_token and per_page != self.page_size:
+            # Continue from the same record offset at the new page size.
+            next_page_token = self._rebase_page(
+                context,
+                (next_page_token - 1) * (per_page or self.api_page_size),
+            )
+        return next_page_token
+
+    def decode_response(self, response: requests.Response) -> Any:
+        """Return the decoded JSON body of a response, decoding it only once.
+
+        The document is cached on the response so pagination, record parsing and
+        the empty-page check all share one decode.
+
+        Args:
+            response: The HTTP ``requests.Response`` object.
+
+        Returns:
+            The decoded JSON document.
+        """
+        document = getattr(response, "_syncro_document", None)
+        if document is None:
+            with self.instrumentation.time("parse"):
+                document = orjson.loads(response.content) if orjson else response.json()
+            response._syncro_document = document  # type: ignore[attr-defined]
+        return document
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Lazily yield the records of a response.
+
+        Args:
+            response: The HTTP ``requests.Response`` object.
+
+        Yields:
+            One item for every record in the response.
+        """
+        yield from extract_jsonpath(
+            self.records_jsonpath, input=self.decode_response(response)
+        )
+
+    def _has_records(self, response: requests.Response) -> bool:
+        return next(iter(self.parse_response(response)), None) is not None
+
     def get_next_page_token(
         self,
         response: requests.Response,
@@ -101,16 +1434,23 @@ class syncroStream(RESTStream):
         #       next page. If this is the final page, return "None" to end the
         #       pagination loop.
         if self.next_page_token_jsonpath:
-            all_matches = extract_jsonpath(
-                self.next_page_token_jsonpath, response.json()
-            )
-            max_page_match = extract_jsonpath(
-                self.max_page_token_jsonpath,response.json()
-            )
+            document = self.decode_response(response)
+            all_matches = extract_jsonpath(self.next_page_token_jsonpath, document)
+            max_page_match = extract_jsonpath(self.max_page_token_jsonpath, document)
 
             first_match = next(iter(all_matches), None)
             max_page_token = next(iter(max_page_match),None)
-            if first_match is not None:
+            if _query_int(response.request, "per_page") is None:
+                self.api_page_size = int(
+                    next(
+                        iter(extract_jsonpath("$.meta.per_page", document)),
+                        self.api_page_size,
+                    )
+                )
+            if not self._has_records(response):
+                # An empty page means filtered results ran out before total_pages.
+                next_page_token = None
+            elif first_match is not None:
                 next_page_candidate = int(first_match) + 1
                 next_page_token = next_page_candidate if max_page_token >= next_page_candidate else None
             else:
@@ -143,6 +1483,9 @@ class syncroStream(RESTStream):
         if self.replication_key:
             params["sort"] = "asc"
             params["order_by"] = self.replication_key
+            updated_since = self.get_updated_since(context)
+            if self.updated_since_param and updated_since:
+                params[self.updated_since_param] = updated_since.isoformat()
 
         if self.page_size:
             params["per_page"] = self.page_size
@@ -151,38 +1494,49 @@ class syncroStream(RESTStream):
 
     def backoff_handler(self, details: Details) -> None:
         super().backoff_handler(details)
+        exception = details.get("exception")
+        response = getattr(exception, "response", None)
+        if response is not None:
+            self.instrumentation.observe_retry(str(response.status_code))
+        else:
+            self.instrumentation.observe_retry(type(exception).__name__)
         # Update page size on retries
         prepared_request = details.get("args")[0]
         if self.page_size:
             parsed_url = urlparse(prepared_request.url)
             current_params = parse_qs(parsed_url.query)
+            if _query_int(prepared_request, "per_page") != self.page_size:
+                # Retry from the first record not emitted yet: the page's start,
+                # plus any records of it skipped as already emitted.
+                context = details.get("args")[1]
+                page, per_page = _page_key(prepared_request)
+                skipped = self._pop_page_skip(context, prepared_request)
+                offset = (page - 1) * (per_page or self.api_page_size) + skipped
+                current_params["page"] = [self._rebase_page(context, offset)]
             current_params["per_page"] = self.page_size
-            prepared_request.prepare_url(parsed_url.geturl(), params=current_params)
-
-    def backoff_wait_generator(self) -> Generator[float, None, None]:
-        """The wait generator used by the backoff decorator on request failure.
+            prepared_request.prepare_url(
+                parsed_url._replace(query="").geturl(), params=current_params
+            )
 
-        See for options:
-        https://github.com/litl/backoff/blob/master/backoff/_wait_gen.py
+    def backoff_wait_generator(  # type: ignore[override]
+        self,
+    ) -> Generator[float | None, BaseException, None]:
+        """Return the wait generator of the shared retry policy.
 
-        And see for examples: `Code Samples <../code_samples.html#custom-backoff>`_
+        See `RetryPolicy` for how waits are chosen for each kind of failure.
 
         Returns:
             The wait generator
         """
+        return self.retry_policy.waits()
 
-        """
-        Example:
-            - 1st retry: 20 seconds
-            - 2nd retry: 40 seconds
-            - 3rd retry: 80 seconds
-            - 4th retry: 160 seconds
-            - 5th retry: 320 seconds
-            - 5th retry: 640 seconds (capped at 10 minutes)
-        """
-        return backoff.expo(base=2, factor=20, max_value=640)
+    def backoff_jitter(self, value: float) -> float:
+        """Return waits unchanged; the retry policy already jitters them."""
+        return value
 
     def validate_response(self, response: requests.Response) -> None:
+        self.rate_limiter.update_from_headers(response.headers)
+        self.instrumentation.observe_response(response)
         x_header = None
         if "X-Request-Id" in response.headers:
             x_header = response.headers["X-Request-Id"]
@@ -199,8 +1553,15 @@ class syncroStream(RESTStream):
 
             if response.status_code == 504 and "gateway time-out" in response.text.lower():
                 self.logger.warn(f"Gateway time-out for URL: {response.request.url}")
-                if not self.page_size or (self.page_size and self.page_size > 1):
-                    self.page_size = self.page_size // 2 if self.page_size else 16
+                if self._fetching_pages_concurrently:
+                    # Not retried: pages in flight were numbered for this page
+                    # size, so `_request_pages_concurrently` falls back to serial.
+                    raise GatewayTimeoutError(self.response_error_message(response))
+                if not self._page_size_locked and (
+                    not self.page_size or self.page_size > 1
+                ):
+                    self.page_size = self._page_size_controller.decrease()
+                    self.instrumentation.observe_page_size(self.page_size)
                     self.logger.warn(f"Decreasing page size to {self.page_size}")
                     
 
@@ -222,4 +1583,91 @@ class syncroStream(RESTStream):
         Returns:
             Number of max retries.
         """
-        return 7 # 7 means 6 retries after first unsuccessful attempt
+        return int(self.config.get("retry_max_tries") or 7)
+
+
+def parse_datetime(value: str | datetime) -> datetime:
+    """Parse a Syncro timestamp, assuming UTC when no offset is given."""
+    parsed = value if isinstance(value, datetime) else date_parser.parse(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _query_int(request: requests.PreparedRequest, name: str) -> int | None:
+    """Return an integer query parameter of a prepared request, if present."""
+    values = parse_qs(urlparse(request.url or "").query).get(name)
+    return int(values[-1]) if values else None
+
+
+def _page_key(request: requests.PreparedRequest) -> tuple[int, int | None]:
+    """Return the page number and size of a request, as keys of page skips."""
+    return _query_int(request, "page") or 1, _query_int(request, "per_page")
+
+
+def _context_key(context: dict | None) -> tuple:
+    """Return a hashable key for a stream context."""
+    return tuple(sorted((context or {}).items()))
+
+
+def compile_id_paths(
+    schema: dict, path: tuple[str, ...] = ()
+) -> list[tuple[str, ...]]:
+    """Return the paths of every string-typed `id` property in a schema.
+
+    Array items are marked with ``"[]"`` in the returned paths.
+    """
+    paths = []
+    types = schema.get("type") or []
+    if "array" in types and "items" in schema:
+        paths.extend(compile_id_paths(schema["items"], path + ("[]",)))
+    for key, prop in (schema.get("properties") or {}).items():
+        if key == "id" and "string" in (prop.get("type") or []):
+            paths.append(path + (key,))
+        elif key != "id":
+            paths.extend(compile_id_paths(prop, path + (key,)))
+    return paths
+
+
+def compile_deselected_paths(
+    schema: dict, mask: Mapping[tuple, bool], breadcrumb: tuple = ()
+) -> list[tuple[str, ...]]:
+    """Return the paths of the properties of a schema deselected in `mask`.
+
+    Like the SDK when writing records, only nested objects are descended into;
+    properties of array items are not pruned.
+    """
+    paths: list[tuple[str, ...]] = []
+    for key, prop in (schema.get("properties") or {}).items():
+        crumb = (*breadcrumb, "properties", key)
+        if not mask[crumb]:
+            paths.append((key,))
+        else:
+            paths.extend(
+                (key, *path) for path in compile_deselected_paths(prop, mask, crumb)
+            )
+    return paths
+
+
+def _pop_path(value: dict, path: tuple[str, ...]) -> None:
+    parent: Any = value
+    for key in path[:-1]:
+        parent = parent.get(key)
+        if not isinstance(parent, dict):
+            return
+    parent.pop(path[-1], None)
+
+
+def _stringify_path(value: Any, path: tuple[str, ...]) -> None:
+    key, rest = path[0], path[1:]
+    if key == "[]":
+        if isinstance(value, list):
+            for item in value:
+                _stringify_path(item, rest)
+    elif isinstance(value, dict):
+        if rest:
+            child = value.get(key)
+            if child:
+                _stringify_path(child, rest)
+        elif value.get(key) is not None and not isinstance(value[key], str):
+            value[key] = str(value[key])
@@ -0,0 +1,120 @@
+"""On-disk index of record content hashes, used to skip unchanged records."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+
+from tap_syncro.output import orjson
+
+
+def fingerprint(record: dict) -> bytes:
+    """Return a digest of a record's content, independent of key order."""
+    if orjson is not None:
+        content = orjson.dumps(
+            record, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        )
+    else:
+        content = json.dumps(record, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class FingerprintIndex:
+    """SQLite index of the last written digest of every record, by stream and id.
+
+    Every digest belongs to a generation, an id that streams keep in their
+    Singer STATE. Digests of another generation are ignored, so a sync without
+    STATE, such as a full resync after a target reset, writes every record again.
+
+    New digests are held until `commit`, which streams call once their records
+    have been written, so a failed run never causes records to be skipped on the
+    next one.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open or create the index.
+
+        Args:
+            path: The SQLite database file.
+        """
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "stream TEXT NOT NULL, id TEXT NOT NULL, generation TEXT NOT NULL, "
+            "digest BLOB NOT NULL, PRIMARY KEY (stream, id))"
+        )
+        self._connection.commit()
+        self._digests: dict[str, dict[str, bytes]] = {}
+        self._pending: dict[str, dict[str, bytes]] = {}
+        self._generations: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def start(self, stream: str, generation: str) -> None:
+        """Load the digests a stream committed in a generation.
+
+        Args:
+            stream: The stream name.
+            generation: The generation id kept in the stream's STATE.
+        """
+        with self._lock:
+            if self._generations.get(stream) == generation:
+                return
+            rows = self._connection.execute(
+                "SELECT id, digest FROM fingerprints "
+                "WHERE stream = ? AND generation = ?",
+                (stream, generation),
+            )
+            self._digests[stream] = dict(rows)
+            self._pending[stream] = {}
+            self._generations[stream] = generation
+
+    def changed(self, stream: str, record_id: object, record: dict) -> bool:
+        """Return whether a record differs from when it was last written.
+
+        Args:
+            stream: The stream name.
+            record_id: The record's id.
+            record: The record, after post-processing.
+
+        Returns:
+            False if the record is identical to the last one committed.
+
+        Raises:
+            KeyError: If `start` was not called for the stream.
+        """
+        key = str(record_id)
+        digest = fingerprint(record)
+        with self._lock:
+            digests = self._digests[stream]
+            if digests.get(key) == digest:
+                return False
+            digests[key] = digest
+            self._pending[stream][key] = digest
+        return True
+
+    def commit(self, stream: str) -> None:
+        """Persist the digests of records written since the last commit.
+
+        Args:
+            stream: The stream name.
+        """
+        with self._lock:
+            pending = self._pending.get(stream)
+            if not pending:
+                return
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO fingerprints (stream, id, generation, digest) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (stream, key, self._generations[stream], digest)
+                    for key, digest in pending.items()
+                ],
+            )
+            self._connection.commit()
+            pending.clear()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
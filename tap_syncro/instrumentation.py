@@ -0,0 +1,163 @@
+"""Per-stream request and processing instrumentation."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+import requests
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class StreamMetrics:
+    """Thread-safe counters and timers describing where a stream spends time."""
+
+    def __init__(self, stream_name: str) -> None:
+        """Create empty metrics.
+
+        Args:
+            stream_name: The stream being measured.
+        """
+        self.stream_name = stream_name
+        self.requests = 0
+        self.bytes = 0
+        self.records = 0
+        self.request_seconds = 0.0
+        self.latency_histogram: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.retries: Counter = Counter()
+        self.page_sizes: list[int | None] = []
+        self.phase_seconds: defaultdict = defaultdict(float)
+        self._started: float | None = None
+        self._finished: float | None = None
+        self._lock = threading.Lock()
+
+    def observe_response(self, response: requests.Response) -> None:
+        """Record the latency, status and size of a response."""
+        latency = response.elapsed.total_seconds()
+        bucket = next(
+            (f"<={bound:g}" for bound in LATENCY_BUCKETS if latency <= bound),
+            f">{LATENCY_BUCKETS[-1]:g}",
+        )
+        size = len(response.content)
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic() - latency
+            self._finished = time.monotonic()
+            self.requests += 1
+            self.bytes += size
+            self.request_seconds += latency
+            self.latency_histogram[bucket] += 1
+            self.statuses[str(response.status_code)] += 1
+
+    def observe_retry(self, reason: str) -> None:
+        """Record a retried request, keyed by status code or exception name."""
+        with self._lock:
+            self.retries[reason] += 1
+
+    def observe_page_size(self, page_size: int | None) -> None:
+        """Record a page size change."""
+        with self._lock:
+            self.page_sizes.append(page_size)
+
+    def observe_records(self, count: int = 1) -> None:
+        """Record emitted records."""
+        with self._lock:
+            self.records += count
+            self._finished = time.monotonic()
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Accumulate the time spent in a processing phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phase_seconds[phase] += elapsed
+
+    def summary(self) -> dict:
+        """Return the metrics as a JSON-serializable dict."""
+        with self._lock:
+            elapsed = (
+                self._finished - self._started
+                if self._started is not None and self._finished is not None
+                else 0.0
+            )
+            return {
+                "requests": self.requests,
+                "bytes": self.bytes,
+                "records": self.records,
+                "records_per_second": round(self.records / elapsed, 2)
+                if elapsed
+                else None,
+                "request_seconds": round(self.request_seconds, 3),
+                "latency_histogram": dict(self.latency_histogram),
+                "statuses": dict(self.statuses),
+                "retries": dict(self.retries),
+                "page_size_changes": list(self.page_sizes),
+                "phase_seconds": {
+                    phase: round(seconds, 3)
+                    for phase, seconds in self.phase_seconds.items()
+                },
+            }
+
+    def metric_points(self) -> list[dict]:
+        """Return the metrics as Singer METRIC points.
+
+        Singer only defines timers and counters, so the latency histogram is
+        reported as one counter per bucket. `records_per_second` is not a
+        point; see `summary`.
+        """
+        summary = self.summary()
+        tags = {"stream": self.stream_name}
+        points = [
+            {
+                "type": "counter",
+                "metric": "http_request_latency_bucket",
+                "value": count,
+                "tags": {**tags, "bucket": bucket},
+            }
+            for bucket, count in summary["latency_histogram"].items()
+        ]
+        points.extend(
+            [
+                {
+                    "type": "counter",
+                    "metric": "http_bytes_downloaded",
+                    "value": summary["bytes"],
+                    "tags": tags,
+                },
+                {
+                    "type": "counter",
+                    "metric": "page_size_changes",
+                    "value": len(summary["page_size_changes"]),
+                    "tags": {**tags, "page_sizes": summary["page_size_changes"]},
+                },
+            ]
+        )
+        points.extend(
+            {
+                "type": "counter",
+                "metric": "http_retries",
+                "value": count,
+                "tags": {**tags, "reason": reason},
+            }
+            for reason, count in summary["retries"].items()
+        )
+        points.extend(
+            {
+                "type": "timer",
+                "metric": "phase_duration",
+                "value": seconds,
+                "tags": {**tags, "phase": phase},
+            }
+            for phase, seconds in summary["phase_seconds"].items()
+        )
+        return points
@@ -0,0 +1,80 @@
+"""Singer message output shared by all syncro streams."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from decimal import Decimal
+from typing import Any
+
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk._singerlib.messages import format_message
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
+# Guards stdout and the shared tap state when several streams sync at once.
+OUTPUT_LOCK = threading.RLock()
+
+
+def fast_output_available() -> bool:
+    """Return whether RECORD messages can be written with `write_record_message`.
+
+    orjson emits UTF-8, so stdout must accept it.
+    """
+    if orjson is None:
+        return False
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    return encoding.lower().replace("-", "") == "utf8"
+
+
+def json_default(value: Any) -> Any:
+    """Return a JSON-serializable stand-in for a value orjson cannot encode.
+
+    Like the SDK's encoder, decimals are written as numbers and anything else as
+    its `str`. A decimal is only converted when the int or float written has
+    exactly its value; otherwise the caller must encode it some other way.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        An int or float for a decimal, otherwise `str(value)`.
+
+    Raises:
+        TypeError: If the value is a decimal a float cannot hold exactly.
+    """
+    if not isinstance(value, Decimal):
+        return str(value)
+    if value.is_finite():
+        if value == value.to_integral_value():
+            return int(value)
+        as_float = float(value)
+        if Decimal(repr(as_float)) == value:
+            return as_float
+    raise TypeError(f"{value} cannot be written exactly as a float")
+
+
+def write_record_message(message: RecordMessage) -> None:
+    """Write a RECORD message to stdout with orjson, without flushing.
+
+    The output matches the SDK's `write_message` except for whitespace, but
+    stdout is left to flush when its buffer fills instead of after every record.
+    Every other message goes through the SDK, which flushes stdout, so message
+    order is preserved. Records orjson cannot write exactly, such as those with
+    a decimal more precise than a float, are formatted by the SDK instead.
+
+    Args:
+        message: The message to write.
+    """
+    try:
+        line = orjson.dumps(
+            message.to_dict(),
+            default=json_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE,
+        ).decode()
+    except orjson.JSONEncodeError:
+        line = format_message(message) + "\n"
+    sys.stdout.write(line)
@@ -0,0 +1,64 @@
+"""Page size control for syncro streams."""
+
+from __future__ import annotations
+
+# Page size used after a gateway time-out when none was configured.
+FALLBACK_PAGE_SIZE = 16
+
+
+class PageSizeController:
+    """Additive-increase / multiplicative-decrease control of a stream's page size.
+
+    The page size is halved on every gateway time-out and grows back by a fixed
+    step after `increase_after` consecutive requests finish within the target
+    latency, up to `maximum`.
+    """
+
+    def __init__(
+        self,
+        size: int | None,
+        maximum: int,
+        target_latency: float,
+        increase_after: int = 3,
+    ) -> None:
+        """Create a controller.
+
+        Args:
+            size: The initial page size, or None to use the API default.
+            maximum: The largest page size to grow back to.
+            target_latency: Requests at or under this many seconds count as fast.
+            increase_after: Consecutive fast requests required before growing.
+        """
+        self.size = size
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.increase_after = increase_after
+        self.step = max(maximum // 8, 1)
+        self._fast_streak = 0
+
+    def decrease(self) -> int:
+        """Halve the page size after a time-out and return the new size."""
+        self.size = max(self.size // 2, 1) if self.size else FALLBACK_PAGE_SIZE
+        self._fast_streak = 0
+        return self.size
+
+    def record_success(self, latency: float) -> bool:
+        """Record a successful request.
+
+        Args:
+            latency: Seconds the request took.
+
+        Returns:
+            True if the page size grew.
+        """
+        if not self.size:
+            return False
+        if latency > self.target_latency:
+            self._fast_streak = 0
+            return False
+        self._fast_streak += 1
+        if self._fast_streak < self.increase_after or self.size >= self.maximum:
+            return False
+        self.size = min(self.size + self.step, self.maximum)
+        self._fast_streak = 0
+        return True
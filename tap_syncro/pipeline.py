@@ -0,0 +1,167 @@
+"""Bounded hand-off between fetching pages and writing their records."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Callable, Iterator
+
+_END = object()
+
+
+class PageBuffer:
+    """A queue bounded by the number of records and bytes it holds.
+
+    `put` blocks while the buffer is over either limit, so the producer fetching
+    pages pauses until the consumer writing records catches up. An empty buffer
+    always admits one item, however large, so a single oversized page cannot
+    stall the pipeline.
+    """
+
+    def __init__(self, max_records: int | None, max_bytes: int | None) -> None:
+        """Create an empty buffer; a falsy limit is not enforced.
+
+        Args:
+            max_records: Records the buffer may hold.
+            max_bytes: Bytes the buffer may hold.
+        """
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.records = 0
+        self.bytes = 0
+        self._items: deque = deque()
+        self._closed = False
+        self._changed = threading.Condition()
+
+    def _has_room(self, records: int, size: int) -> bool:
+        if not self._items:
+            return True
+        if self.max_records and self.records + records > self.max_records:
+            return False
+        if self.max_bytes and self.bytes + size > self.max_bytes:
+            return False
+        return True
+
+    def put(self, item: Any, records: int = 0, size: int = 0) -> bool:
+        """Add an item, waiting for room.
+
+        Args:
+            item: The item to add.
+            records: Records the item holds.
+            size: Bytes the item holds.
+
+        Returns:
+            False if the buffer was closed and the item was dropped.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._closed or self._has_room(records, size)
+            )
+            if self._closed:
+                return False
+            self._items.append((item, records, size))
+            self.records += records
+            self.bytes += size
+            self._changed.notify_all()
+            return True
+
+    def get(self) -> Any:
+        """Remove and return the oldest item, waiting for one."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._items)
+            item, records, size = self._items.popleft()
+            self.records -= records
+            self.bytes -= size
+            self._changed.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Drop buffered items and release a waiting producer."""
+        with self._changed:
+            self._closed = True
+            self._items.clear()
+            self.records = self.bytes = 0
+            self._changed.notify_all()
+
+
+class BufferedIterator:
+    """Iterate over `items` as they are consumed by a background thread.
+
+    The producer thread starts right away and runs ahead of the caller by at
+    most `max_records` records and `max_bytes` bytes, plus the item being
+    processed. Exceptions raised by the producer are re-raised to the caller.
+    Call `close` to stop early; `items` is then closed as well.
+    """
+
+    def __init__(
+        self,
+        items: Iterator,
+        weigh: Callable[[Any], tuple[int, int]],
+        max_records: int | None,
+        max_bytes: int | None,
+        name: str = "producer",
+    ) -> None:
+        """Start producing.
+
+        Args:
+            items: The items to produce, e.g. response pages.
+            weigh: Return the `(records, bytes)` held by an item.
+            max_records: Records that may be buffered.
+            max_bytes: Bytes that may be buffered.
+            name: Name of the producer thread.
+        """
+        self._buffer = PageBuffer(max_records, max_bytes)
+        self._closed = False
+        self._producer = threading.Thread(
+            target=self._produce, args=(items, weigh), name=name, daemon=True
+        )
+        self._producer.start()
+
+    def _produce(
+        self, items: Iterator, weigh: Callable[[Any], tuple[int, int]]
+    ) -> None:
+        buffer = self._buffer
+        try:
+            for item in items:
+                if not buffer.put((item, None), *weigh(item)):
+                    return
+            buffer.put((_END, None))
+        except BaseException as ex:  # noqa: BLE001 - re-raised by the consumer
+            buffer.put((_END, ex))
+        finally:
+            close = getattr(items, "close", None)
+            if close:
+                close()
+
+    def __iter__(self) -> BufferedIterator:
+        return self
+
+    def __next__(self) -> Any:
+        if self._closed:
+            raise StopIteration
+        item, error = self._buffer.get()
+        if error is not None:
+            self.close()
+            raise error
+        if item is _END:
+            self.close()
+            raise StopIteration
+        return item
+
+    def close(self) -> None:
+        """Stop the producer and drop buffered items."""
+        if not self._closed:
+            self._closed = True
+            self._buffer.close()
+            self._producer.join()
+
+
+def buffered(
+    items: Iterator,
+    weigh: Callable[[Any], tuple[int, int]],
+    max_records: int | None,
+    max_bytes: int | None,
+    name: str = "producer",
+) -> BufferedIterator:
+    """Start consuming `items` in a background thread; see `BufferedIterator`."""
+    return BufferedIterator(items, weigh, max_records, max_bytes, name)
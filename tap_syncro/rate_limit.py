@@ -0,0 +1,107 @@
+"""Client-side request pacing shared by all syncro streams."""
+
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+# Header values above this are treated as epoch timestamps rather than seconds.
+_EPOCH_THRESHOLD = 10**9
+
+
+class RateLimiter:
+    """Token bucket that paces requests across every stream of a tap run.
+
+    Tokens refill continuously at `requests_per_minute`. Callers that find the
+    bucket empty take a token on credit and sleep until it would have refilled,
+    so concurrent callers are queued fairly instead of spinning.
+    """
+
+    def __init__(self, requests_per_minute: float | None) -> None:
+        """Create a limiter; a falsy rate disables pacing.
+
+        Args:
+            requests_per_minute: Sustained request rate to allow.
+        """
+        self.rate = (requests_per_minute or 0) / 60.0
+        self.capacity = max(self.rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            paused = max(self._paused_until - now, 0.0)
+            if not self.rate:
+                return paused
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, paused)
+
+    def acquire(self) -> None:
+        """Block until the caller may send a request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least `seconds`."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._paused_until = max(self._paused_until, until)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Pause according to `Retry-After` or an exhausted rate-limit window.
+
+        Args:
+            headers: Response headers.
+        """
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            self.pause(retry_after)
+            return
+
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get(
+            "RateLimit-Remaining"
+        )
+        reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            if int(remaining) > 0:
+                return
+            seconds = float(reset)
+        except ValueError:
+            return
+        if seconds > _EPOCH_THRESHOLD:
+            seconds -= time.time()
+        if seconds > 0:
+            self.pause(seconds)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header given in seconds or as an HTTP date.
+
+    Args:
+        value: The raw header value.
+
+    Returns:
+        Seconds to wait, or None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
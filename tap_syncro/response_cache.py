@@ -0,0 +1,145 @@
+"""On-disk HTTP response cache, for development runs and offline replays."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+def cache_key(prepared_request: requests.PreparedRequest) -> str:
+    """Return the cache key of a request: its method and URL, params sorted."""
+    url = urlparse(prepared_request.url or "")
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+    normalized = url._replace(query=query).geturl()
+    request_line = f"{prepared_request.method} {normalized}"
+    return hashlib.sha256(request_line.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Successful responses stored on disk, keyed by method and URL.
+
+    Each entry is a `<key>.body` file holding the response body and a
+    `<key>.json` file holding its status, headers and timing. Entries expire
+    after `ttl` seconds, and the oldest are evicted once the bodies exceed
+    `max_bytes`. In replay mode entries never expire, and nothing is evicted or
+    written, so a recorded run can be served again exactly.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+        replay: bool = False,
+    ) -> None:
+        """Open a cache directory, creating it if needed.
+
+        Args:
+            directory: Where entries are stored.
+            ttl: Seconds an entry stays fresh; None never expires entries.
+            max_bytes: Total body size to keep; None keeps everything.
+            replay: Serve entries regardless of age and never store new ones.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self._lock = threading.Lock()
+        # Body sizes of the stored entries, least recently stored first.
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        entries = sorted(
+            self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime
+        )
+        for meta_path in entries:
+            body_path = meta_path.with_suffix(".body")
+            if body_path.exists():
+                self._sizes[meta_path.stem] = body_path.stat().st_size
+        self._total = sum(self._sizes.values())
+
+    def get(
+        self, prepared_request: requests.PreparedRequest
+    ) -> requests.Response | None:
+        """Return the stored response to a request, if present and fresh.
+
+        Args:
+            prepared_request: The request about to be sent.
+
+        Returns:
+            The stored response, or None.
+        """
+        key = cache_key(prepared_request)
+        meta_path = self.directory / f"{key}.json"
+        try:
+            meta = json.loads(meta_path.read_text())
+            content = meta_path.with_suffix(".body").read_bytes()
+        except (FileNotFoundError, ValueError):
+            return None
+        if not self.replay and self.ttl is not None:
+            if time.time() - meta["stored_at"] > self.ttl:
+                return None
+
+        response = requests.Response()
+        response.status_code = meta["status_code"]
+        response.reason = meta.get("reason")
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = meta.get("encoding")
+        response.url = prepared_request.url or ""
+        response.elapsed = timedelta(seconds=meta.get("elapsed", 0))
+        response.request = prepared_request
+        response._content = content
+        return response
+
+    def put(
+        self, prepared_request: requests.PreparedRequest, response: requests.Response
+    ) -> None:
+        """Store a successful response, evicting the oldest entries if needed.
+
+        Args:
+            prepared_request: The request that was sent.
+            response: Its response.
+        """
+        if self.replay or not response.ok:
+            return
+        key = cache_key(prepared_request)
+        meta = {
+            "url": prepared_request.url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "elapsed": response.elapsed.total_seconds(),
+            "stored_at": time.time(),
+        }
+        # Written to temporary files first so readers never see partial entries.
+        body_path = self.directory / f"{key}.body"
+        meta_path = self.directory / f"{key}.json"
+        suffix = f".{threading.get_ident()}.tmp"
+        body_tmp = body_path.with_name(body_path.name + suffix)
+        meta_tmp = meta_path.with_name(meta_path.name + suffix)
+        body_tmp.write_bytes(response.content)
+        meta_tmp.write_text(json.dumps(meta))
+        os.replace(body_tmp, body_path)
+        os.replace(meta_tmp, meta_path)
+
+        with self._lock:
+            self._total += len(response.content) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(response.content)
+            while self.max_bytes and self._total > self.max_bytes and self._sizes:
+                evicted, size = self._sizes.popitem(last=False)
+                self._total -= size
+                for suffix in (".json", ".body"):
+                    try:
+                        (self.directory / f"{evicted}{suffix}").unlink()
+                    except FileNotFoundError:
+                        pass
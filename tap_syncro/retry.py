@@ -0,0 +1,104 @@
+"""Retry policy shared by all syncro streams."""
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import Generator
+
+import requests
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_syncro.rate_limit import parse_retry_after
+
+# Connection resets and dropped streams usually clear up within a second or two.
+CONNECTION_BASE_DELAY = 0.25
+CONNECTION_MAX_DELAY = 5.0
+
+
+class RetryPolicy:
+    """How long to wait before retrying a failed request, and whether to at all.
+
+    Waits use decorrelated jitter: each is drawn between the base delay and three
+    times the previous wait, capped at `max_delay`. Connection errors retry on a
+    shorter schedule, and a 429 waits exactly as long as its `Retry-After` header
+    asks. Every retry spends one unit of a budget shared by the whole run; once
+    it is spent, failing requests are given up on at once instead of sleeping.
+    """
+
+    def __init__(
+        self,
+        base_delay: float,
+        max_delay: float,
+        budget: int | None = None,
+    ) -> None:
+        """Create a policy.
+
+        Args:
+            base_delay: Shortest wait before retrying, in seconds.
+            max_delay: Longest wait before retrying, in seconds.
+            budget: Retries allowed across the run; None allows any number.
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries = 0
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def spend(self) -> bool:
+        """Take one retry from the budget, returning False if none are left."""
+        with self._lock:
+            if self.budget is not None and self.retries >= self.budget:
+                return False
+            self.retries += 1
+            return True
+
+    def waits(self) -> Generator[float | None, BaseException, None]:
+        """Return a backoff wait generator for the attempts of one request.
+
+        The generator is sent each exception and yields the seconds to wait
+        before the next attempt. It stops when the retry budget is spent, which
+        makes backoff give up and re-raise the exception.
+        """
+        previous = {"default": self.base_delay, "connection": CONNECTION_BASE_DELAY}
+        exception = yield None
+        while self.spend():
+            retry_after = _retry_after(exception)
+            if retry_after is not None:
+                exception = yield retry_after
+                continue
+            if _is_connection_error(exception):
+                schedule = "connection"
+                base = CONNECTION_BASE_DELAY
+                cap = min(CONNECTION_MAX_DELAY, self.max_delay)
+            else:
+                schedule, base, cap = "default", self.base_delay, self.max_delay
+            with self._lock:
+                wait = self._random.uniform(base, previous[schedule] * 3)
+            previous[schedule] = min(cap, wait)
+            exception = yield previous[schedule]
+
+
+def _retry_after(exception: BaseException) -> float | None:
+    """Return the `Retry-After` of a 429 response, if the exception carries one."""
+    response = getattr(exception, "response", None)
+    if not isinstance(exception, RetriableAPIError) or response is None:
+        return None
+    if response.status_code != 429:
+        return None
+    return parse_retry_after(response.headers.get("Retry-After"))
+
+
+def _is_connection_error(exception: BaseException) -> bool:
+    """Return whether a request failed before any response was received."""
+    if isinstance(exception, requests.exceptions.Timeout):
+        return False
+    return isinstance(
+        exception,
+        (
+            ConnectionResetError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    )
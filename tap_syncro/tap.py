@@ -2,18 +2,38 @@
 
 from __future__ import annotations
 
+import importlib.util
+import json
+import sys
+import threading
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, cast
+
+import requests
+from requests.adapters import HTTPAdapter
 from singer_sdk import Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
-import inspect
+from singer_sdk._singerlib import Catalog, StateMessage, write_message
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.streams import Stream
 
 # TODO: Import your custom stream types here:
 from tap_syncro import streams
+from tap_syncro.fingerprints import FingerprintIndex
+from tap_syncro.output import OUTPUT_LOCK
+from tap_syncro.rate_limit import RateLimiter
+from tap_syncro.response_cache import ResponseCache
+from tap_syncro.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from tap_syncro.transport import AsyncTransport
 
 
 class Tapsyncro(Tap):
     """syncro tap class."""
 
     name = "tap-syncro"
+    _resource_lock = threading.Lock()
 
     # TODO: Update this section with the actual config values you expect:
     config_jsonschema = th.PropertiesList(
@@ -28,17 +48,608 @@ class Tapsyncro(Tap):
             "subdomain",
             th.StringType
         ),
+        th.Property(
+            "api_url",
+            th.StringType,
+            description=(
+                "Override the API root, e.g. for a local mock server; "
+                "defaults to https://{subdomain}.syncromsp.com/api/v1"
+            ),
+        ),
+        th.Property(
+            "start_date",
+            th.DateTimeType,
+            description="The earliest `updated_at` to sync for incremental streams",
+        ),
+        th.Property(
+            "max_concurrency",
+            th.IntegerType,
+            default=1,
+            description="Number of pages of a stream to request concurrently",
+        ),
+        th.Property(
+            "stream_concurrency",
+            th.IntegerType,
+            default=1,
+            description="Number of streams to sync concurrently",
+        ),
+        th.Property(
+            "requests_per_minute",
+            th.NumberType,
+            default=180,
+            description=(
+                "Request rate shared by all streams; Syncro allows 180 per minute. "
+                "Set to 0 to disable client-side pacing"
+            ),
+        ),
+        th.Property(
+            "page_size",
+            th.IntegerType,
+            description="Records to request per page",
+        ),
+        th.Property(
+            "max_page_size",
+            th.IntegerType,
+            description=(
+                "Largest page size to grow back to after gateway time-outs; "
+                "defaults to page_size"
+            ),
+        ),
+        th.Property(
+            "target_request_seconds",
+            th.NumberType,
+            default=10,
+            description="Request latency under which the page size may grow back",
+        ),
+        th.Property(
+            "backfill_window_days",
+            th.IntegerType,
+            description=(
+                "Split tickets and invoices into windows of this many days from "
+                "`start_date`, each with its own bookmark, and fetch up to "
+                "`max_concurrency` windows at once"
+            ),
+        ),
+        th.Property(
+            "checkpoint_interval_pages",
+            th.IntegerType,
+            default=50,
+            description=(
+                "Pages between mid-stream checkpoints written to STATE, used to "
+                "resume an interrupted sync. Set to 0 to disable"
+            ),
+        ),
+        th.Property(
+            "metrics_summary_path",
+            th.StringType,
+            description="File to write a JSON summary of per-stream metrics to",
+        ),
+        th.Property(
+            "connect_timeout",
+            th.NumberType,
+            default=10,
+            description="Seconds to wait for a connection to Syncro",
+        ),
+        th.Property(
+            "request_timeout",
+            th.NumberType,
+            default=300,
+            description="Seconds to wait for a response once connected",
+        ),
+        th.Property(
+            "retry_base_seconds",
+            th.NumberType,
+            default=1,
+            description="Shortest wait before retrying a failed request",
+        ),
+        th.Property(
+            "retry_max_seconds",
+            th.NumberType,
+            default=60,
+            description=(
+                "Longest wait before retrying a failed request, unless a 429 "
+                "response's `Retry-After` asks for longer"
+            ),
+        ),
+        th.Property(
+            "retry_max_tries",
+            th.IntegerType,
+            default=7,
+            description="Attempts of a request before giving up",
+        ),
+        th.Property(
+            "retry_budget",
+            th.IntegerType,
+            description=(
+                "Retries allowed across the whole run. Once spent, failing "
+                "requests fail the sync at once instead of waiting to retry"
+            ),
+        ),
+        th.Property(
+            "compress_responses",
+            th.BooleanType,
+            default=True,
+            description="Ask Syncro for gzip-compressed responses",
+        ),
+        th.Property(
+            "max_buffered_records",
+            th.IntegerType,
+            default=5000,
+            description=(
+                "Records a stream may fetch ahead of writing them. Fetching "
+                "pauses while the target catches up. Set to 0 for no limit"
+            ),
+        ),
+        th.Property(
+            "max_buffered_bytes",
+            th.IntegerType,
+            default=64 * 2**20,
+            description=(
+                "Response bytes a stream may fetch ahead of writing them. "
+                "Set to 0 for no limit"
+            ),
+        ),
+        th.Property(
+            "fast_output",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Serialize RECORD messages with orjson and flush stdout in "
+                "batches rather than after every record. Requires "
+                "tap-syncro[fast-output]"
+            ),
+        ),
+        th.Property(
+            "normalize_customers",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Replace the customer object embedded in appointments, assets and "
+                "payments with `customer_id`, and write each distinct customer "
+                "once to the `embedded_customers` stream"
+            ),
+        ),
+        th.Property(
+            "embedded_customers_cache_size",
+            th.IntegerType,
+            default=10000,
+            description=(
+                "Customer snapshots remembered by `normalize_customers`; a "
+                "customer evicted from the cache is written again when next seen"
+            ),
+        ),
+        th.Property(
+            "derive_embedded_records",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Take line_items from the line items embedded in invoices, and "
+                "contacts from those embedded in customers, rather than paging "
+                "their own endpoints, when both streams are selected and the "
+                "source stream has no bookmark yet. A start_date applies to the "
+                "records derived as it would to the endpoints. The endpoint is "
+                "still used if source records come without them"
+            ),
+        ),
+        th.Property(
+            "fingerprint_index_path",
+            th.StringType,
+            description=(
+                "SQLite file recording a content hash of every record written. "
+                "Streams Syncro cannot filter by `updated_at` skip records whose "
+                "hash has not changed since the last run. Hashes are tied to the "
+                "stream's STATE, so a sync from empty STATE writes every record"
+            ),
+        ),
+        th.Property(
+            "response_cache_dir",
+            th.StringType,
+            description=(
+                "Directory to cache successful API responses in, for development "
+                "runs. Requests found in the cache are not sent"
+            ),
+        ),
+        th.Property(
+            "response_cache_ttl",
+            th.NumberType,
+            default=3600,
+            description="Seconds a cached response is served for",
+        ),
+        th.Property(
+            "response_cache_max_bytes",
+            th.IntegerType,
+            default=2**30,
+            description="Total size of cached responses before the oldest are evicted",
+        ),
+        th.Property(
+            "response_cache_replay",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Serve every request from `response_cache_dir` regardless of age, "
+                "failing on requests that were not recorded"
+            ),
+        ),
+        th.Property(
+            "batch_config",
+            th.ObjectType(
+                th.Property(
+                    "encoding",
+                    th.ObjectType(
+                        th.Property(
+                            "format",
+                            th.StringType,
+                            allowed_values=["jsonl", "parquet"],
+                            description=(
+                                "Format of batch files; parquet requires "
+                                "tap-syncro[parquet]"
+                            ),
+                        ),
+                        th.Property(
+                            "compression",
+                            th.StringType,
+                            allowed_values=["gzip", "none"],
+                            description="Compression of batch files",
+                        ),
+                    ),
+                ),
+                th.Property(
+                    "storage",
+                    th.ObjectType(
+                        th.Property(
+                            "root",
+                            th.StringType,
+                            description=(
+                                "Directory or URL to write batch files to, e.g. "
+                                "`file:///tmp/batches` or, with the `s3` extra, "
+                                "`s3://bucket/path`"
+                            ),
+                        ),
+                        th.Property(
+                            "prefix",
+                            th.StringType,
+                            description="Prefix of batch file names",
+                        ),
+                    ),
+                ),
+                th.Property(
+                    "batch_size",
+                    th.IntegerType,
+                    description="Records per batch file; defaults to 10000",
+                ),
+            ),
+            description=(
+                "Write records to files and emit BATCH messages instead of RECORD "
+                "messages. Child streams, such as worksheet_results, derived "
+                "streams and embedded_customers still emit RECORD messages"
+            ),
+        ),
+        th.Property(
+            "transport",
+            th.StringType,
+            default="requests",
+            allowed_values=["requests", "async"],
+            description=(
+                "HTTP transport. `async` sends requests as coroutines over one "
+                "event loop and connection pool, and requires the `async` extra"
+            ),
+        ),
     ).to_dict()
 
+    _rate_limiter: RateLimiter | None = None
+    _retry_policy: RetryPolicy | None = None
+    _requests_session: requests.Session | None = None
+    _async_transport: AsyncTransport | None = None
+    _fingerprint_index: FingerprintIndex | None = None
+    _response_cache: ResponseCache | None = None
+    _sync_aborted: threading.Event | None = None
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Return the rate limiter shared by every stream."""
+        with self._resource_lock:
+            if self._rate_limiter is None:
+                self._rate_limiter = RateLimiter(
+                    self.config.get("requests_per_minute", 180)
+                )
+            return self._rate_limiter
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Return the retry policy, and its budget, shared by every stream."""
+        with self._resource_lock:
+            if self._retry_policy is None:
+                self._retry_policy = RetryPolicy(
+                    base_delay=self.config.get("retry_base_seconds", 1),
+                    max_delay=self.config.get("retry_max_seconds", 60),
+                    budget=self.config.get("retry_budget"),
+                )
+            return self._retry_policy
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the keep-alive session every stream sends its requests through."""
+        with self._resource_lock:
+            if self._requests_session is None:
+                self._requests_session = self._build_requests_session()
+            return self._requests_session
+
+    @property
+    def async_transport(self) -> AsyncTransport | None:
+        """Return the asyncio transport, or None when using `requests`."""
+        if self.config.get("transport", "requests") != "async":
+            return None
+        with self._resource_lock:
+            if self._async_transport is None:
+                # Imported here so that httpx is only loaded when used.
+                from tap_syncro.transport import AsyncTransport
+
+                self._async_transport = AsyncTransport(self._pool_size())
+            return self._async_transport
+
+    @property
+    def fingerprint_index(self) -> FingerprintIndex | None:
+        """Return the index of written record hashes, if configured."""
+        if not self.config.get("fingerprint_index_path"):
+            return None
+        with self._resource_lock:
+            if self._fingerprint_index is None:
+                self._fingerprint_index = FingerprintIndex(
+                    self.config["fingerprint_index_path"]
+                )
+            return self._fingerprint_index
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the on-disk response cache, if configured."""
+        if not self.config.get("response_cache_dir"):
+            return None
+        with self._resource_lock:
+            if self._response_cache is None:
+                self._response_cache = ResponseCache(
+                    self.config["response_cache_dir"],
+                    ttl=self.config.get("response_cache_ttl", 3600),
+                    max_bytes=self.config.get("response_cache_max_bytes", 2**30),
+                    replay=self.config.get("response_cache_replay", False),
+                )
+            return self._response_cache
+
+    @property
+    def sync_aborted(self) -> threading.Event:
+        """Return the event set when one of the streams synced concurrently fails.
+
+        The other streams stop at their next request instead of running to the end.
+        """
+        with self._resource_lock:
+            if self._sync_aborted is None:
+                self._sync_aborted = threading.Event()
+            return self._sync_aborted
+
+    def _validate_config(
+        self, *, raise_errors: bool = True, warnings_as_errors: bool = False
+    ) -> tuple[list[str], list[str]]:
+        """Validate the config, including that enabled features are installed.
+
+        Args:
+            raise_errors: Whether to raise if validation fails.
+            warnings_as_errors: Whether to raise on warnings as well.
+
+        Returns:
+            The validation warnings and errors.
+
+        Raises:
+            ConfigValidationError: If a feature's optional package is missing.
+        """
+        warnings, errors = super()._validate_config(
+            raise_errors=raise_errors, warnings_as_errors=warnings_as_errors
+        )
+        missing = self._missing_packages()
+        if missing and raise_errors:
+            raise ConfigValidationError("; ".join(missing))
+        return warnings, errors + missing
+
+    def _missing_packages(self) -> list[str]:
+        """Return an error for every enabled feature whose package is missing."""
+        required = []
+        if self.config.get("transport") == "async":
+            required.append(("httpx", "`transport: async`", "async"))
+        if self.config.get("fast_output"):
+            required.append(("orjson", "`fast_output`", "fast-output"))
+        batch_config = self.config.get("batch_config") or {}
+        if batch_config.get("encoding", {}).get("format") == "parquet":
+            required.append(("pyarrow", "Parquet `batch_config`", "parquet"))
+        return [
+            f"{feature} requires {package}: pip install 'tap-syncro[{extra}]'"
+            for package, feature, extra in required
+            if importlib.util.find_spec(package) is None
+        ]
+
+    def _pool_size(self) -> int:
+        return max(
+            int(self.config.get("max_concurrency") or 1)
+            * int(self.config.get("stream_concurrency") or 1),
+            requests.adapters.DEFAULT_POOLSIZE,
+        )
+
+    def _build_requests_session(self) -> requests.Session:
+        pool_size = self._pool_size()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        compress = self.config.get("compress_responses", True)
+        session.headers["Accept-Encoding"] = "gzip, deflate" if compress else "identity"
+        return session
+
     def discover_streams(self) -> list[streams.syncroStream]:
-        """Return a list of discovered streams.
+        """Return the streams of the tap.
+
+        With an input catalog, only the streams it selects are constructed, with
+        the parents of selected child streams. Streams missing from the catalog
+        are selected by default, as in the SDK.
 
         Returns:
-            A list of discovered streams.
+            A list of streams.
         """
+        stream_types = streams.STREAM_TYPES
+        if self.input_catalog is not None:
+            stream_types = self._required_stream_types(self.input_catalog)
+        return [stream_type(self) for stream_type in stream_types]
+
+    def _required_stream_types(
+        self, catalog: Catalog
+    ) -> list[type[streams.syncroStream]]:
+        """Return the stream types needed to sync the input catalog's selection."""
+        required: set[type[streams.syncroStream]] = set()
+        for stream_type in streams.STREAM_TYPES:
+            entry = catalog.get_stream(stream_type.name)  # type: ignore[misc]
+            if entry is None or entry.metadata.resolve_selection()[()]:
+                required.add(stream_type)
+        if self.config.get("normalize_customers") and any(
+            stream_type.embeds_customer for stream_type in required
+        ):
+            # Embedded customers are taken out of records even when not written.
+            required.add(streams.EmbeddedCustomersStream)
+        for stream_type in list(required):
+            parent = stream_type.parent_stream_type
+            while parent is not None:
+                required.add(cast("type[streams.syncroStream]", parent))
+                parent = parent.parent_stream_type
         return [
-           cls(self) for name, cls in inspect.getmembers(streams,inspect.isclass) if cls.__module__ == 'tap_syncro.streams'
+            stream_type
+            for stream_type in streams.STREAM_TYPES
+            if stream_type in required
         ]
 
+    @classmethod
+    def invoke(  # type: ignore[override]
+        cls,
+        *,
+        about: bool = False,
+        about_format: str | None = None,
+        config: tuple[str, ...] = (),
+        state: str | None = None,
+        catalog: str | None = None,
+    ) -> None:
+        """Invoke the tap's command line interface, syncing with `sync_streams`.
+
+        Args:
+            about: Display package metadata and settings.
+            about_format: Specify output style for `--about`.
+            config: Configuration file location or 'ENV' to use environment
+                variables. Accepts multiple inputs as a tuple.
+            catalog: Use a Singer catalog file with the tap.
+            state: Use a bookmarks file for incremental replication.
+        """
+        # Skips `Tap.invoke`, which would sync with `sync_all` instead.
+        super(Tap, cls).invoke(about=about, about_format=about_format)
+        cls.print_version(print_fn=cls.logger.info)
+        config_files, parse_env_config = cls.config_from_cli_args(*config)
+
+        tap = cls(
+            config=config_files,  # type: ignore[arg-type]
+            state=state,
+            catalog=catalog,
+            parse_env_config=parse_env_config,
+            validate_config=True,
+        )
+        tap.sync_streams()
+
+    def sync_streams(self) -> None:
+        """Sync all streams, several at a time when `stream_concurrency` allows.
+
+        Replaces the SDK's `sync_all`, which syncs streams one at a time in name
+        order. Here derived streams are synced after their source, and output is
+        flushed, instrumentation reported and the tap's resources released at the
+        end.
+        """
+        self.sync_aborted.clear()
+        workers = int(self.config.get("stream_concurrency") or 1)
+        try:
+            self._reset_state_progress_markers()
+            self._set_compatible_replication_methods()
+            with OUTPUT_LOCK:
+                write_message(StateMessage(value=self.state))
+
+            to_sync = self._streams_to_sync()
+            if workers <= 1:
+                for stream in to_sync:
+                    self._sync_stream(stream)
+            else:
+                self._sync_concurrently(to_sync, workers)
+
+            for stream in self.streams.values():
+                stream.log_sync_costs()
+        finally:
+            # RECORD messages are not flushed one by one; see `fast_output`.
+            sys.stdout.flush()
+            self._report_instrumentation()
+            if self._async_transport is not None:
+                self._async_transport.close()
+                self._async_transport = None
+            if self._fingerprint_index is not None:
+                self._fingerprint_index.close()
+                self._fingerprint_index = None
+
+    def _streams_to_sync(self) -> list[Stream]:
+        """Return the selected top-level streams, derived streams last.
+
+        A derived stream is synced after the stream it is derived from, whose
+        records tell it whether its own endpoint must be paged after all.
+        """
+        to_sync = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+            elif not stream.parent_stream_type:
+                to_sync.append(stream)
+        return sorted(
+            to_sync,
+            key=lambda stream: getattr(stream, "derived_from", None) is not None,
+        )
+
+    def _sync_concurrently(self, to_sync: list[Stream], workers: int) -> None:
+        executor = ThreadPoolExecutor(workers, thread_name_prefix="stream")
+        # Sources are submitted before the streams derived from them, so a
+        # derived stream never waits on one that is not running yet.
+        by_name: dict[str | None, Future] = {}
+        try:
+            for stream in to_sync:
+                source = by_name.get(getattr(stream, "derived_from", None))
+                by_name[stream.name] = executor.submit(
+                    self._sync_stream, stream, source
+                )
+            done, _ = wait(by_name.values(), return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+        except BaseException:
+            # Fail now rather than once the other streams finish: those not
+            # started are cancelled and the running ones stop at their next request.
+            self.sync_aborted.set()
+            for future in by_name.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+            raise
+        executor.shutdown(wait=True)
+
+    def _report_instrumentation(self) -> None:
+        """Log per-stream METRIC messages and write the optional JSON summary."""
+        summary = {}
+        for stream in cast("list[streams.syncroStream]", list(self.streams.values())):
+            stream.log_instrumentation()
+            if stream.instrumentation.requests:
+                summary[stream.name] = stream.instrumentation.summary()
+
+        if self.config.get("metrics_summary_path"):
+            with open(self.config["metrics_summary_path"], "w") as summary_file:
+                json.dump(summary, summary_file, indent=2)
+
+    @staticmethod
+    def _sync_stream(stream: Stream, after: Future | None = None) -> None:
+        if after is not None:
+            after.result()
+        stream.sync()
+        stream.finalize_state_progress_markers()
+
 if __name__ == "__main__":
     Tapsyncro.cli()
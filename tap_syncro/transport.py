@@ -0,0 +1,129 @@
+"""Optional asyncio HTTP transport, used when `transport` is set to `async`."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed for the async transport
+    httpx = None  # type: ignore[assignment]
+
+
+class AsyncTransport:
+    """Send requests as coroutines on one event loop and connection pool.
+
+    The loop runs in a daemon thread. Synchronous code waits on it with `run`,
+    or hands it coroutines with `submit` and collects the futures later, so many
+    requests can be in flight without a thread for each. Responses are converted
+    to `requests.Response` objects, so stream code and `validate_response` work
+    the same as with the `requests` transport.
+    """
+
+    def __init__(self, max_connections: int) -> None:
+        """Start the event loop and create the client.
+
+        Args:
+            max_connections: Maximum number of open connections.
+
+        Raises:
+            ImportError: If httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError(
+                "The async transport requires httpx: pip install 'tap-syncro[async]'"
+            )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="syncro-transport", daemon=True
+        )
+        self._thread.start()
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._client = self.run(self._create_client(limits))
+
+    async def _create_client(self, limits: Any) -> Any:
+        # The client binds to the loop it is created on.
+        return httpx.AsyncClient(limits=limits)
+
+    def run(self, coroutine: Coroutine) -> Any:
+        """Run a coroutine on the transport's loop and wait for its result."""
+        return self.submit(coroutine).result()
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """Schedule a coroutine on the transport's loop and return its future."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def send(
+        self,
+        prepared_request: requests.PreparedRequest,
+        timeout: tuple[float, float] | float | None,
+    ) -> requests.Response:
+        """Send a prepared request.
+
+        Args:
+            prepared_request: The request, as prepared by the stream.
+            timeout: A `(connect, read)` tuple or a single timeout in seconds.
+
+        Returns:
+            The response, converted to a `requests.Response`.
+
+        Raises:
+            requests.exceptions.ConnectTimeout: If connecting timed out.
+            requests.exceptions.ReadTimeout: If the response timed out.
+            requests.exceptions.ConnectionError: On other transport errors.
+        """
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        request = self._client.build_request(
+            prepared_request.method or "GET",
+            prepared_request.url or "",
+            headers=dict(prepared_request.headers),
+            content=prepared_request.body,
+            timeout=httpx.Timeout(read, connect=connect),
+        )
+        # Errors are raised as their `requests` equivalents so the retry policy,
+        # which is written against `requests`, applies unchanged.
+        try:
+            response = await self._client.send(request)
+        except httpx.ConnectTimeout as ex:
+            raise requests.exceptions.ConnectTimeout(
+                ex, request=prepared_request
+            ) from ex
+        except httpx.TimeoutException as ex:
+            raise requests.exceptions.ReadTimeout(ex, request=prepared_request) from ex
+        except httpx.TransportError as ex:
+            raise requests.exceptions.ConnectionError(
+                ex, request=prepared_request
+            ) from ex
+        return _to_requests_response(response, prepared_request)
+
+    def close(self) -> None:
+        """Close the connection pool and stop the loop."""
+        self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def _to_requests_response(
+    response: Any, prepared_request: requests.PreparedRequest
+) -> requests.Response:
+    """Return an httpx response as a `requests.Response`."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers.items())
+    converted._content = response.content
+    converted.encoding = response.charset_encoding
+    converted.url = str(response.url)
+    converted.elapsed = response.elapsed
+    converted.request = prepared_request
+    return converted
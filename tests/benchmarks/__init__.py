@@ -0,0 +1 @@
+"""Benchmarks run against a local mock Syncro API."""
@@ -0,0 +1,296 @@
+"""A local stand-in for the Syncro API serving synthetic paginated payloads."""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable
+from urllib.parse import parse_qs, urlparse
+
+from dateutil import parser as date_parser
+
+from tap_syncro import streams
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+DEFAULT_PER_PAGE = 25
+
+
+def _embedding_customers() -> set[str]:
+    """Return the paths of endpoints whose records embed a customer object."""
+    return {cls.path for cls in streams.STREAM_TYPES if cls.embeds_customer}
+
+
+def _embedded_keys() -> dict[str, list[str]]:
+    """Map endpoint paths to the keys of records other streams derive from them."""
+    paths = {cls.name: getattr(cls, "path", None) for cls in streams.STREAM_TYPES}
+    keys: dict[str, list[str]] = {}
+    for cls in streams.STREAM_TYPES:
+        if cls.derived_from:
+            keys.setdefault(paths[cls.derived_from], []).append(cls.embedded_key)
+    return keys
+
+
+def _records_keys() -> dict[str, str]:
+    """Map endpoint path patterns to the key holding their records, e.g. tickets.
+
+    Path templates such as `/tickets/{ticket_id}/worksheet_results` become
+    patterns matching any id.
+    """
+    keys = {}
+    for cls in streams.STREAM_TYPES:
+        match = re.match(r"\$\.(\w+)\[\*\]", cls.records_jsonpath)
+        if getattr(cls, "path", None) and match:
+            pattern = re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(cls.path))
+            keys[pattern] = match.group(1)
+    return keys
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many concurrent clients connect at once; the default backlog of 5 makes
+    # the excess wait on SYN retransmits.
+    request_queue_size = 128
+
+
+class MockSyncroAPI:
+    """Serve `/api/v1/<endpoint>` pages of synthetic records on localhost.
+
+    Every endpoint holds `total_records` records whose `updated_at` increases
+    `record_interval` minutes per id, and honours `page`, `per_page` and
+    `since_updated_at`. Nested endpoints, like a ticket's worksheet results,
+    hold `child_records`, as do the arrays embedded in records that other
+    streams derive from, like an invoice's line items, unless `embed_derived`
+    is unset. Records of streams that embed customers embed one of 50
+    customers. Records are served oldest first, or newest first when
+    `newest_first` is set.
+    Responses can be slowed down and 429/504 errors injected at random.
+    Requests, bytes, connections and the most requests in flight at once are
+    counted.
+    """
+
+    def __init__(
+        self,
+        total_records: int = 1000,
+        record_size: int = 200,
+        latency: float = 0.0,
+        error_rate_429: float = 0.0,
+        error_rate_504: float = 0.0,
+        seed: int = 0,
+        child_records: int = 2,
+        record_interval: float = 1.0,
+        newest_first: bool = False,
+        embed_derived: bool = True,
+        time_out_above: int | None = None,
+    ) -> None:
+        """Create the server; call `start` or use it as a context manager.
+
+        Args:
+            total_records: Number of records served by each endpoint.
+            record_size: Approximate size in bytes of each record's padding.
+            latency: Seconds to sleep before answering each request.
+            error_rate_429: Fraction of requests answered with 429.
+            error_rate_504: Fraction of requests answered with a 504 time-out.
+            seed: Seed for error injection.
+            child_records: Number of records served by each nested endpoint.
+            record_interval: Minutes between the `updated_at` of consecutive ids.
+            newest_first: Whether to serve records in reverse order.
+            embed_derived: Whether records embed the arrays of derived streams.
+            time_out_above: Page size above which pages after the first answer
+                with a 504 time-out.
+        """
+        self.total_records = total_records
+        self.record_size = record_size
+        self.latency = latency
+        self.error_rate_429 = error_rate_429
+        self.error_rate_504 = error_rate_504
+        self.child_records = child_records
+        self.record_interval = record_interval
+        self.newest_first = newest_first
+        self.time_out_above = time_out_above
+        self.requests = 0
+        self.bytes_sent = 0
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self.statuses: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._records_keys = _records_keys()
+        self._embedding_customers = _embedding_customers()
+        self._embedded_keys = _embedded_keys() if embed_derived else {}
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to use as the tap's `api_url`."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def start(self) -> MockSyncroAPI:
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> MockSyncroAPI:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def record(
+        self,
+        index: int,
+        embed_customer: bool = False,
+        embedded_keys: Iterable[str] = (),
+    ) -> dict:
+        """Return the synthetic record with the given index."""
+        updated_at = EPOCH + timedelta(minutes=index * self.record_interval)
+        record = {
+            "id": index + 1,
+            "customer_id": index % 50,
+            "created_at": (updated_at - timedelta(days=1)).isoformat(),
+            "updated_at": updated_at.isoformat(),
+            "name": f"Record {index}",
+            "body": "x" * self.record_size,
+        }
+        if embed_customer:
+            record["customer"] = {
+                "id": index % 50,
+                "business_name": f"Customer {index % 50}",
+                "updated_at": EPOCH.isoformat(),
+                "contacts": [{"id": index % 50 * 10, "name": "Contact"}],
+            }
+        for key in embedded_keys:
+            record[key] = [
+                {
+                    "id": index * self.child_records + offset + 1,
+                    "updated_at": updated_at.isoformat(),
+                    "name": f"Embedded {offset}",
+                }
+                for offset in range(self.child_records)
+            ]
+        return record
+
+    def page(self, endpoint: str, query: dict) -> dict:
+        """Return the document for one page of an endpoint."""
+        per_page = int(query.get("per_page", [DEFAULT_PER_PAGE])[-1])
+        page = int(query.get("page", [1])[-1])
+        key = next(
+            (
+                key
+                for pattern, key in self._records_keys.items()
+                if re.fullmatch(pattern, endpoint)
+            ),
+            endpoint.strip("/"),
+        )
+        records = self.child_records if endpoint.count("/") > 1 else self.total_records
+        first = 0
+        if "since_updated_at" in query:
+            since = date_parser.parse(query["since_updated_at"][-1])
+            intervals = (since - EPOCH).total_seconds() / 60 / self.record_interval
+            first = min(max(int(-(-intervals // 1)), 0), records)
+        total = records - first
+        start = first + (page - 1) * per_page
+        end = min(start + per_page, records)
+        indexes = range(start, end)
+        if self.newest_first:
+            indexes = range(
+                records - 1 - (start - first), records - 1 - (end - first), -1
+            )
+        return {
+            key: [
+                self.record(
+                    index,
+                    endpoint in self._embedding_customers,
+                    self._embedded_keys.get(endpoint, ()),
+                )
+                for index in indexes
+            ],
+            "meta": {
+                "page": page,
+                "per_page": per_page,
+                "total_pages": max(-(-total // per_page), 1),
+                "total_entries": total,
+            },
+        }
+
+    def _inject_error(self, query: dict) -> int | None:
+        if self.time_out_above is not None:
+            per_page = int(query.get("per_page", [DEFAULT_PER_PAGE])[-1])
+            page = int(query.get("page", [1])[-1])
+            if page > 1 and per_page > self.time_out_above:
+                return 504
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.error_rate_429:
+            return 429
+        if roll < self.error_rate_429 + self.error_rate_504:
+            return 504
+        return None
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def setup(self) -> None:
+                super().setup()
+                with api._lock:
+                    api.connections += 1
+
+            def do_GET(self) -> None:  # noqa: N802
+                with api._lock:
+                    api._in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api._in_flight)
+                try:
+                    self._respond()
+                finally:
+                    with api._lock:
+                        api._in_flight -= 1
+
+            def _respond(self) -> None:
+                url = urlparse(self.path)
+                if api.latency:
+                    time.sleep(api.latency)
+                status = api._inject_error(parse_qs(url.query))
+                headers = {"Content-Type": "application/json"}
+                if status == 429:
+                    body = b'{"error": "rate limited"}'
+                    headers["Retry-After"] = "1"
+                elif status == 504:
+                    body = b"<html><h1>504 Gateway Time-out</h1></html>"
+                else:
+                    status = 200
+                    endpoint = url.path.split("/api/v1", 1)[-1]
+                    document = api.page(endpoint, parse_qs(url.query))
+                    body = json.dumps(document).encode()
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with api._lock:
+                    api.requests += 1
+                    api.bytes_sent += len(body)
+                    api.statuses[status] += 1
+
+        return Handler
@@ -0,0 +1,210 @@
+"""Benchmark tap-syncro streams against the local mock Syncro API.
+
+Example::
+
+    python -m tests.benchmarks.run tickets line_items --records 5000 \\
+        --latency 0.05 --config '{"max_concurrency": 4}'
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Iterable
+
+from tap_syncro.tap import Tapsyncro
+from tests.benchmarks.mock_api import MockSyncroAPI
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one stream sync."""
+
+    stream: str
+    records: int
+    requests: int
+    bytes: int
+    seconds: float
+    records_per_second: float
+    peak_memory_bytes: int
+
+
+class _CountingWriter:
+    """Stand-in for stdout that counts RECORD messages and discards the rest."""
+
+    def __init__(self) -> None:
+        self.records = 0
+
+    def write(self, text: str) -> int:
+        self.records += text.count('"type": "RECORD"') + text.count('"type":"RECORD"')
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def build_tap(
+    api: MockSyncroAPI,
+    selected: Iterable[str],
+    config: dict | None = None,
+    state: dict | None = None,
+) -> Tapsyncro:
+    """Create a tap reading from `api` with only the `selected` streams selected.
+
+    Args:
+        api: A started mock API.
+        selected: The streams to select.
+        config: Extra tap config.
+        state: Tap state to start from.
+
+    Returns:
+        The tap.
+    """
+    tap = Tapsyncro(
+        config={
+            "auth_token": "benchmark",
+            "api_url": api.base_url,
+            "requests_per_minute": 0,
+            **(config or {}),
+        },
+        state=state,
+        parse_env_config=False,
+    )
+    selected = set(selected)
+    for stream in tap.streams.values():
+        stream.selected = stream.name in selected
+    return tap
+
+
+def run_stream(
+    api: MockSyncroAPI,
+    stream_name: str,
+    config: dict | None = None,
+    state: dict | None = None,
+    trace_memory: bool = True,
+    extra_streams: Iterable[str] = (),
+) -> BenchmarkResult:
+    """Sync a single stream from `api` and measure it.
+
+    Args:
+        api: A started mock API.
+        stream_name: The stream to select.
+        config: Extra tap config.
+        state: Tap state to start from.
+        trace_memory: Whether to measure peak memory with tracemalloc.
+        extra_streams: Other streams to select; their records are counted too.
+
+    Returns:
+        The measurements.
+    """
+    tap = build_tap(api, [stream_name, *extra_streams], config, state)
+
+    requests_before, bytes_before = api.requests, api.bytes_sent
+    writer = _CountingWriter()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(writer):  # type: ignore[type-var]
+            tap.sync_streams()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    return BenchmarkResult(
+        stream=stream_name,
+        records=writer.records,
+        requests=api.requests - requests_before,
+        bytes=api.bytes_sent - bytes_before,
+        seconds=round(seconds, 3),
+        records_per_second=round(writer.records / seconds, 1) if seconds else 0.0,
+        peak_memory_bytes=peak,
+    )
+
+
+@dataclass
+class SyncOutput:
+    """The Singer messages written by one sync."""
+
+    tap: Tapsyncro
+    messages: list[dict]
+
+    def records(self, stream_name: str) -> list[dict]:
+        """Return the records written for a stream, in order."""
+        return [
+            message["record"]
+            for message in self.messages
+            if message["type"] == "RECORD" and message["stream"] == stream_name
+        ]
+
+    @property
+    def state(self) -> dict:
+        """Return the last STATE message's value."""
+        states = [m["value"] for m in self.messages if m["type"] == "STATE"]
+        return states[-1] if states else {}
+
+
+def sync_messages(
+    api: MockSyncroAPI,
+    selected: Iterable[str],
+    config: dict | None = None,
+    state: dict | None = None,
+) -> SyncOutput:
+    """Sync the `selected` streams from `api` and collect the messages written.
+
+    Args:
+        api: A started mock API.
+        selected: The streams to select.
+        config: Extra tap config.
+        state: Tap state to start from.
+
+    Returns:
+        The tap and its messages.
+    """
+    tap = build_tap(api, selected, config, state)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        tap.sync_streams()
+    messages = [json.loads(line) for line in output.getvalue().splitlines() if line]
+    return SyncOutput(tap, messages)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run benchmarks from the command line and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("streams", nargs="+", help="Streams to benchmark")
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--record-size", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate-504", type=float, default=0.0)
+    parser.add_argument("--config", type=json.loads, default={}, help="Tap config")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    with MockSyncroAPI(
+        total_records=args.records,
+        record_size=args.record_size,
+        latency=args.latency,
+        error_rate_429=args.error_rate_429,
+        error_rate_504=args.error_rate_504,
+    ) as api:
+        for stream_name in args.streams:
+            result = run_stream(
+                api, stream_name, args.config, trace_memory=not args.no_memory
+            )
+            sys.stderr.write(json.dumps(asdict(result)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
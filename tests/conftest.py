@@ -1,3 +1,14 @@
 """Test Configuration."""
 
+import pytest
+
+from tests.benchmarks.mock_api import MockSyncroAPI
+
 pytest_plugins = ("singer_sdk.testing.pytest_plugin",)
+
+
+@pytest.fixture(scope="module")
+def api():
+    """A mock Syncro API serving 120 small records per endpoint."""
+    with MockSyncroAPI(total_records=120, record_size=20) as api:
+        yield api
@@ -0,0 +1,41 @@
+"""Tests of BATCH file output."""
+
+import gzip
+
+import pytest
+from singer_sdk.helpers._batch import BatchConfig
+
+from tap_syncro.batch import SyncroBatcher
+from tests.benchmarks.run import run_stream
+
+BATCH_CONFIG = {
+    "encoding": {"format": "jsonl", "compression": "gzip"},
+    "storage": {"root": "file:///tmp"},
+}
+
+
+def test_batch_files_replace_record_messages(api, tmp_path):
+    config = {
+        "page_size": 25,
+        "batch_config": {
+            "encoding": {"format": "jsonl", "compression": "gzip"},
+            "storage": {"root": tmp_path.as_uri()},
+            "batch_size": 50,
+        },
+    }
+    result = run_stream(api, "tickets", config, trace_memory=False)
+
+    files = sorted(tmp_path.glob("*.json.gz"))
+    assert result.records == 0
+    assert len(files) == 3
+    assert sum(len(gzip.open(path).readlines()) for path in files) == 120
+
+
+def test_batchers_must_define_a_file_format():
+    class Incomplete(SyncroBatcher):
+        @property
+        def extension(self) -> str:
+            return ".txt"
+
+    with pytest.raises(TypeError):
+        Incomplete("tap-syncro", "tickets", BatchConfig.from_dict(BATCH_CONFIG))
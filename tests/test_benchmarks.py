@@ -0,0 +1,12 @@
+"""Checks of the benchmark harness."""
+
+from tests.benchmarks.run import run_stream
+
+
+def test_benchmark_measures_a_stream(api):
+    result = run_stream(api, "tickets", {"page_size": 25})
+
+    assert result.records == 120
+    assert result.requests == 5
+    assert result.bytes > 0
+    assert result.peak_memory_bytes > 0
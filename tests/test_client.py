@@ -0,0 +1,353 @@
+"""Tests of the syncroStream base class against the mock Syncro API."""
+
+from collections import Counter
+
+import pytest
+import requests
+
+from tap_syncro import client
+from tap_syncro.tap import Tapsyncro
+from tests.benchmarks.mock_api import MockSyncroAPI
+from tests.benchmarks.run import run_stream, sync_messages
+
+FAST_RETRIES = {
+    "retry_base_seconds": 0.001,
+    "retry_max_seconds": 0.002,
+    "retry_max_tries": 20,
+}
+
+
+def _prepared(url: str) -> requests.PreparedRequest:
+    return requests.Request("GET", url).prepare()
+
+
+def test_full_sync_reads_every_page(api):
+    result = run_stream(api, "tickets", {"page_size": 25}, trace_memory=False)
+
+    assert result.records == 120
+    assert result.requests == 5
+
+
+def test_concurrent_pages_are_written_complete_and_in_order():
+    config = {"page_size": 25, "max_concurrency": 4}
+    with MockSyncroAPI(total_records=300, record_size=20, latency=0.02) as api:
+        output = sync_messages(api, ["tickets"], config)
+
+    ids = [int(record["id"]) for record in output.records("tickets")]
+    assert ids == list(range(1, 301))
+    assert api.max_in_flight > 1
+
+
+def test_incremental_sync_starts_at_bookmark(api):
+    state = {
+        "bookmarks": {
+            "tickets": {
+                "replication_key": "updated_at",
+                "replication_key_value": "2020-01-01T01:00:00+00:00",
+            }
+        }
+    }
+    result = run_stream(api, "tickets", {"page_size": 25}, state, trace_memory=False)
+
+    assert result.records == 60
+
+
+def test_checkpoints_are_written_while_paging_and_removed_at_the_end(api):
+    config = {"page_size": 25, "checkpoint_interval_pages": 2}
+    output = sync_messages(api, ["tickets"], config)
+
+    states = [
+        message["value"].get("bookmarks", {}).get("tickets", {})
+        for message in output.messages
+        if message["type"] == "STATE"
+    ]
+    checkpoints = [state["checkpoint"] for state in states if "checkpoint" in state]
+    assert [checkpoint["page"] for checkpoint in checkpoints] == [3, 5]
+    assert checkpoints[0]["per_page"] == 25
+    assert int(checkpoints[0]["last_id"]) == 50
+    assert "checkpoint" not in output.state["bookmarks"]["tickets"]
+
+
+@pytest.mark.parametrize("page_size", [25, 20, 30])
+def test_sync_resumes_from_a_checkpoint(api, page_size):
+    checkpoint = {"page": 3, "per_page": 25, "updated_since": None}
+    state = {"bookmarks": {"tickets": {"checkpoint": checkpoint}}}
+    config = {"page_size": page_size, "checkpoint_interval_pages": 2}
+
+    output = sync_messages(api, ["tickets"], config, state)
+
+    ids = [int(record["id"]) for record in output.records("tickets")]
+    assert ids == list(range(51, 121))
+
+
+@pytest.mark.parametrize("page_size", [25, 20, 30])
+@pytest.mark.parametrize("last_id", [50, 47], ids=["in-place", "shifted"])
+def test_sync_resumes_after_the_last_record_written(api, page_size, last_id):
+    checkpoint = {"page": 3, "per_page": 25, "updated_since": None, "last_id": last_id}
+    state = {"bookmarks": {"tickets": {"checkpoint": checkpoint}}}
+    config = {"page_size": page_size, "checkpoint_interval_pages": 2}
+
+    output = sync_messages(api, ["tickets"], config, state)
+
+    ids = [int(record["id"]) for record in output.records("tickets")]
+    assert ids == list(range(last_id + 1, 121))
+
+
+def test_checkpoints_are_written_after_the_children_of_their_pages():
+    config = {"page_size": 25, "checkpoint_interval_pages": 2, "max_concurrency": 4}
+    with MockSyncroAPI(total_records=120, record_size=5) as api:
+        output = sync_messages(api, ["tickets", "worksheet_results"], config)
+
+    checkpoint_at = next(
+        index
+        for index, message in enumerate(output.messages)
+        if message["type"] == "STATE"
+        and "checkpoint" in message["value"].get("bookmarks", {}).get("tickets", {})
+    )
+    children = [
+        message
+        for message in output.messages[:checkpoint_at]
+        if message["type"] == "RECORD" and message["stream"] == "worksheet_results"
+    ]
+    # Two results for each of the 50 tickets of the checkpointed pages.
+    assert len(children) == 50 * 2
+
+
+def test_checkpoints_of_another_lower_bound_are_ignored(api):
+    checkpoint = {
+        "page": 3,
+        "per_page": 25,
+        "updated_since": "2019-01-01T00:00:00+00:00",
+    }
+    state = {"bookmarks": {"tickets": {"checkpoint": checkpoint}}}
+
+    output = sync_messages(api, ["tickets"], {"page_size": 25}, state)
+
+    assert len(output.records("tickets")) == 120
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_each_response_is_decoded_once(api, monkeypatch, max_concurrency):
+    decodes = []
+    decode = requests.Response.json
+
+    def counting_decode(response, *args, **kwargs):
+        decodes.append(response.url)
+        return decode(response, *args, **kwargs)
+
+    monkeypatch.setattr(client, "orjson", None)
+    monkeypatch.setattr(requests.Response, "json", counting_decode)
+    requests_before = api.requests
+    config = {"page_size": 25, "max_concurrency": max_concurrency}
+
+    sync_messages(api, ["tickets"], config)
+
+    assert len(decodes) == api.requests - requests_before == 5
+    assert len(set(decodes)) == 5
+
+
+def test_child_stream_fans_out_per_parent(api):
+    result = run_stream(
+        api,
+        "worksheet_results",
+        {"page_size": 25, "max_concurrency": 4},
+        trace_memory=False,
+    )
+
+    assert result.records == 120 * 2
+    assert result.requests == 5 + 120
+
+
+def test_async_transport_reads_every_page(api):
+    pytest.importorskip("httpx")
+    result = run_stream(
+        api,
+        "worksheet_results",
+        {"page_size": 25, "max_concurrency": 4, "transport": "async"},
+        trace_memory=False,
+    )
+
+    assert result.records == 120 * 2
+    assert result.requests == 5 + 120
+
+
+def test_backfill_windows_skip_completed_windows():
+    config = {
+        "start_date": "2020-01-01T00:00:00Z",
+        "backfill_window_days": 365,
+        "max_concurrency": 4,
+    }
+    # One record a day from 2020 to mid 2022: three windows hold records.
+    with MockSyncroAPI(
+        total_records=900, record_size=20, record_interval=24 * 60
+    ) as api:
+        backfill = run_stream(api, "tickets", config, trace_memory=False)
+        state = {
+            "bookmarks": {
+                "tickets": {
+                    "partitions": [
+                        {
+                            "context": {"window_start": "2020-01-01T00:00:00+00:00"},
+                            "window_complete": True,
+                        }
+                    ]
+                }
+            }
+        }
+        resumed = run_stream(api, "tickets", config, state, trace_memory=False)
+
+    assert backfill.records == 900
+    assert resumed.records == 900 - 365
+
+
+def test_backfill_windows_stop_paging_at_their_end():
+    config = {"start_date": "2020-01-01T00:00:00Z", "max_concurrency": 4}
+    with MockSyncroAPI(
+        total_records=900, record_size=20, record_interval=24 * 60
+    ) as api:
+        plain = run_stream(api, "tickets", config, trace_memory=False)
+        windowed = run_stream(
+            api,
+            "tickets",
+            {**config, "backfill_window_days": 365},
+            trace_memory=False,
+        )
+    tap = Tapsyncro(
+        config={"auth_token": "test", **config, "backfill_window_days": 365},
+        parse_env_config=False,
+    )
+    windows = len(tap.streams["tickets"].partitions)
+
+    assert windowed.records == plain.records == 900
+    # At most one page of each window overlaps the next.
+    assert windowed.requests <= plain.requests + windows
+
+
+def test_backfill_windows_do_not_rely_on_the_sort_order():
+    config = {
+        "start_date": "2020-01-01T00:00:00Z",
+        "backfill_window_days": 365,
+        "max_concurrency": 4,
+    }
+    with MockSyncroAPI(
+        total_records=900, record_size=20, record_interval=24 * 60, newest_first=True
+    ) as api:
+        output = sync_messages(api, ["tickets"], config)
+
+    ids = [int(record["id"]) for record in output.records("tickets")]
+    assert sorted(ids) == list(range(1, 901))
+
+
+def test_id_paths_are_compiled_from_string_typed_ids():
+    schema = {
+        "properties": {
+            "id": {"type": ["string", "null"]},
+            "number_id": {"type": ["integer"]},
+            "owner": {"type": ["object"], "properties": {"id": {"type": ["integer"]}}},
+            "tags": {
+                "type": ["array"],
+                "items": {"properties": {"id": {"type": ["string"]}}},
+            },
+        }
+    }
+
+    assert client.compile_id_paths(schema) == [("id",), ("tags", "[]", "id")]
+
+
+def test_post_process_stringifies_ids_along_compiled_paths():
+    tap = Tapsyncro(config={"auth_token": "test"}, parse_env_config=False)
+    row = {
+        "id": 0,
+        "customer": {"id": 7, "contacts": [{"id": 8}, {"id": None}]},
+        "user_id": 3,
+    }
+
+    tap.streams["appointments"].post_process(row)
+
+    assert row == {
+        "id": "0",
+        "customer": {"id": "7", "contacts": [{"id": "8"}, {"id": None}]},
+        "user_id": 3,
+    }
+
+
+def test_deselected_properties_are_pruned_before_post_process():
+    tap = Tapsyncro(config={"auth_token": "test"}, parse_env_config=False)
+    stream = tap.streams["payments"]
+    stream.metadata[("properties", "customer")].selected = False
+    record = {"id": 1, "customer": {"id": 2, "contacts": []}, "customer_id": 2}
+
+    assert stream.post_process(stream.prune(record)) == {"id": "1", "customer_id": 2}
+
+
+def test_retry_after_page_size_change_resumes_from_pending_skip():
+    tap = Tapsyncro(config={"auth_token": "test"}, parse_env_config=False)
+    stream = tap.streams["tickets"]
+    stream.page_size = 40
+    # Page 3 at 50 per page was rebased to skip its first 10 records, then failed.
+    stream._page_skips[()] = {(3, 50): 10}
+    request = _prepared("https://example.com/tickets?page=3&per_page=50")
+
+    stream.backoff_handler({"args": (request, None), "exception": None})
+
+    # Records 0-109 were emitted, so the retry starts at record 110.
+    assert "page=3" in request.url and "per_page=40" in request.url
+    assert stream._page_skips == {(): {(3, 40): 30}}
+
+
+def test_retry_without_per_page_uses_the_api_default():
+    tap = Tapsyncro(config={"auth_token": "test"}, parse_env_config=False)
+    stream = tap.streams["tickets"]
+    stream.page_size = 16
+    request = _prepared("https://example.com/tickets?page=2")
+
+    stream.backoff_handler({"args": (request, None), "exception": None})
+
+    # Records 0-24 were emitted at the default 25 per page.
+    assert "page=2" in request.url and "per_page=16" in request.url
+    assert stream._page_skips == {(): {(2, 16): 9}}
+
+
+@pytest.mark.parametrize(
+    "config",
+    [{"page_size": 40}, {}, {"page_size": 40, "max_page_size": 100}],
+    ids=["fixed", "api-default", "growing"],
+)
+@pytest.mark.parametrize("seed", [1, 3])
+def test_gateway_time_outs_neither_lose_nor_repeat_records(config, seed):
+    with MockSyncroAPI(
+        total_records=500, record_size=5, error_rate_504=0.15, seed=seed
+    ) as api:
+        output = sync_messages(api, ["tickets"], {**FAST_RETRIES, **config})
+
+    ids = [int(record["id"]) for record in output.records("tickets")]
+    assert api.statuses[504] > 0
+    assert sorted(ids) == list(range(1, 501))
+
+
+@pytest.mark.parametrize("async_transport", [False, True], ids=["threads", "async"])
+def test_gateway_time_out_of_concurrent_pages_falls_back_to_serial(async_transport):
+    config = {
+        **FAST_RETRIES,
+        "page_size": 40,
+        "max_concurrency": 4,
+        "async_transport": async_transport,
+    }
+    with MockSyncroAPI(total_records=300, record_size=5, time_out_above=20) as api:
+        output = sync_messages(api, ["tickets"], config)
+
+    ids = [int(record["id"]) for record in output.records("tickets")]
+    assert ids == list(range(1, 301))
+    assert api.statuses[504] > 0
+
+
+def test_gateway_time_outs_of_concurrent_child_fetches_keep_records_per_parent():
+    config = {**FAST_RETRIES, "page_size": 25, "max_concurrency": 4}
+    with MockSyncroAPI(total_records=300, record_size=5, error_rate_504=0.2) as api:
+        output = sync_messages(api, ["tickets", "worksheet_results"], config)
+
+    results = output.records("worksheet_results")
+    per_ticket = Counter(record["ticket_id"] for record in results)
+    assert len(output.records("tickets")) == 300
+    assert set(per_ticket.values()) == {2}
+    assert len(per_ticket) == 300
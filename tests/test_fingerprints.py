@@ -0,0 +1,22 @@
+"""Tests of the record fingerprint index."""
+
+from tests.benchmarks.run import sync_messages
+
+
+def test_fingerprint_index_skips_unchanged_records(api, tmp_path):
+    config = {"fingerprint_index_path": str(tmp_path / "fingerprints.db")}
+
+    first = sync_messages(api, ["products"], config)
+    second = sync_messages(api, ["products"], config, first.state)
+
+    assert len(first.records("products")) == 120
+    assert second.records("products") == []
+
+
+def test_fingerprint_index_writes_every_record_without_state(api, tmp_path):
+    config = {"fingerprint_index_path": str(tmp_path / "fingerprints.db")}
+
+    sync_messages(api, ["products"], config)
+    resync = sync_messages(api, ["products"], config, state={})
+
+    assert len(resync.records("products")) == 120
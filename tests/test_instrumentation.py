@@ -0,0 +1,37 @@
+"""Tests of stream instrumentation."""
+
+from datetime import timedelta
+
+import requests
+
+from tap_syncro.instrumentation import StreamMetrics
+
+
+def _response(seconds: float, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.elapsed = timedelta(seconds=seconds)
+    response._content = b"{}"
+    return response
+
+
+def test_metric_points_only_use_singer_metric_types():
+    metrics = StreamMetrics("tickets")
+    for seconds in (0.05, 0.05, 0.3, 120):
+        metrics.observe_response(_response(seconds))
+    metrics.observe_retry("429")
+    metrics.observe_page_size(50)
+    metrics.observe_records(10)
+    with metrics.time("parse"):
+        pass
+
+    points = metrics.metric_points()
+
+    assert {point["type"] for point in points} <= {"timer", "counter"}
+    latency = {
+        point["tags"]["bucket"]: point["value"]
+        for point in points
+        if point["metric"] == "http_request_latency_bucket"
+    }
+    assert latency == {"<=0.1": 2, "<=0.5": 1, ">60": 1}
+    assert all(isinstance(point["value"], (int, float)) for point in points)
@@ -0,0 +1,57 @@
+"""Tests of RECORD message output."""
+
+import json
+from decimal import Decimal
+
+import pytest
+from singer_sdk._singerlib import RecordMessage
+
+from tap_syncro.batch import _json_line
+from tap_syncro.output import json_default, write_record_message
+from tap_syncro.tap import Tapsyncro
+from tests.benchmarks.run import sync_messages
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(Decimal("10"), 10), (Decimal("1.5"), 1.5), (Decimal("0.1"), 0.1)],
+)
+def test_decimals_a_float_holds_exactly_are_converted(value, expected):
+    assert json_default(value) == expected
+    assert type(json_default(value)) is type(expected)
+
+
+@pytest.mark.parametrize(
+    "value", ["12345678901234567.89", "0.1000000000000000055", "NaN"]
+)
+def test_decimals_a_float_cannot_hold_are_refused(value):
+    with pytest.raises(TypeError):
+        json_default(Decimal(value))
+
+
+def test_record_messages_keep_decimal_precision(capsys):
+    record = {"id": 1, "total": Decimal("12345678901234567.89"), "tax": Decimal("1.5")}
+
+    write_record_message(RecordMessage(stream="invoices", record=record))
+
+    message = json.loads(capsys.readouterr().out, parse_float=Decimal)
+    assert message["record"] == record
+
+
+def test_batch_lines_keep_decimal_precision():
+    line = _json_line({"total": Decimal("12345678901234567.89"), "tax": Decimal("1.5")})
+
+    assert json.loads(line) == {"total": "12345678901234567.89", "tax": 1.5}
+
+
+def test_fast_output_is_off_by_default():
+    properties = Tapsyncro.config_jsonschema["properties"]
+
+    assert properties["fast_output"]["default"] is False
+
+
+def test_fast_output_writes_the_same_records(api):
+    expected = sync_messages(api, ["tickets"]).records("tickets")
+    fast = sync_messages(api, ["tickets"], {"fast_output": True})
+
+    assert fast.records("tickets") == expected
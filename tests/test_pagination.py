@@ -0,0 +1,42 @@
+"""Tests of page size control."""
+
+from tap_syncro.pagination import FALLBACK_PAGE_SIZE, PageSizeController
+
+
+def test_time_outs_halve_the_page_size():
+    controller = PageSizeController(100, maximum=100, target_latency=1.0)
+
+    assert [controller.decrease() for _ in range(8)] == [50, 25, 12, 6, 3, 1, 1, 1]
+
+
+def test_time_outs_without_a_page_size_fall_back_to_a_small_one():
+    controller = PageSizeController(None, maximum=100, target_latency=1.0)
+
+    assert controller.decrease() == FALLBACK_PAGE_SIZE
+
+
+def test_page_size_grows_back_after_consecutive_fast_requests():
+    controller = PageSizeController(100, maximum=100, target_latency=1.0)
+    controller.decrease()
+
+    grew = [controller.record_success(0.5) for _ in range(6)]
+
+    assert grew == [False, False, True, False, False, True]
+    assert controller.size == 50 + 2 * controller.step
+
+
+def test_slow_requests_reset_the_streak():
+    controller = PageSizeController(50, maximum=100, target_latency=1.0)
+
+    for latency in (0.5, 0.5, 2.0, 0.5, 0.5):
+        assert not controller.record_success(latency)
+    assert controller.record_success(0.5)
+
+
+def test_page_size_never_grows_past_the_maximum():
+    controller = PageSizeController(95, maximum=100, target_latency=1.0)
+
+    for _ in range(30):
+        controller.record_success(0.1)
+
+    assert controller.size == 100
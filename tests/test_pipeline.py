@@ -0,0 +1,74 @@
+"""Tests of the bounded page pipeline."""
+
+import itertools
+import time
+
+import pytest
+
+from tap_syncro.pipeline import PageBuffer, buffered
+
+
+def _settle(produced: list, timeout: float = 2.0) -> None:
+    """Wait until the producer stops producing, i.e. blocks on a full buffer."""
+    deadline = time.monotonic() + timeout
+    count = -1
+    while len(produced) != count and time.monotonic() < deadline:
+        count = len(produced)
+        time.sleep(0.05)
+
+
+@pytest.mark.parametrize("max_records, max_bytes", [(30, None), (None, 300), (30, 300)])
+def test_producer_runs_ahead_by_at_most_the_limits(max_records, max_bytes):
+    produced = []
+
+    def pages():
+        for page in range(20):
+            produced.append(page)
+            yield page
+
+    items = buffered(pages(), lambda page: (10, 100), max_records, max_bytes)
+    _settle(produced)
+
+    # Three pages fit in the buffer; a fourth waits for room.
+    assert len(produced) == 4
+    assert list(items) == list(range(20))
+
+
+def test_an_empty_buffer_admits_an_oversized_item():
+    buffer = PageBuffer(max_records=5, max_bytes=10)
+
+    assert buffer.put("page", records=100, size=1000)
+    assert buffer.get() == "page"
+
+
+def test_producer_errors_are_raised_to_the_consumer():
+    def pages():
+        yield 1
+        yield 2
+        raise ValueError("fetch failed")
+
+    items = buffered(pages(), lambda page: (1, 0), 10, None)
+
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(ValueError, match="fetch failed"):
+        next(items)
+
+
+def test_closing_stops_the_producer_and_closes_its_source():
+    closed = []
+
+    def pages():
+        try:
+            yield from itertools.count()
+        finally:
+            closed.append(True)
+
+    items = buffered(pages(), lambda page: (1, 0), 5, None)
+    assert next(items) == 0
+
+    items.close()
+
+    assert closed == [True]
+    assert not items._producer.is_alive()
+    assert list(items) == []
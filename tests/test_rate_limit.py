@@ -0,0 +1,77 @@
+"""Tests of client-side request pacing."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from tap_syncro import rate_limit
+from tap_syncro.rate_limit import RateLimiter, parse_retry_after
+from tap_syncro.tap import Tapsyncro
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the limiter's clock at 1000 seconds; tests advance it by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_requests_beyond_the_burst_are_spaced_at_the_rate(clock):
+    limiter = RateLimiter(requests_per_minute=120)
+
+    assert [limiter.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock[0] += 1.0
+    assert limiter.reserve() == 0.5
+
+
+def test_no_rate_disables_pacing(clock):
+    limiter = RateLimiter(requests_per_minute=0)
+
+    assert [limiter.reserve() for _ in range(100)] == [0.0] * 100
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"Retry-After": "3"},
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"},
+        {"RateLimit-Remaining": "0", "RateLimit-Reset": "3"},
+    ],
+)
+def test_rate_limit_headers_pause_every_caller(clock, headers):
+    limiter = RateLimiter(requests_per_minute=0)
+
+    limiter.update_from_headers(headers)
+
+    assert limiter.reserve() == 3.0
+    clock[0] += 3.0
+    assert limiter.reserve() == 0.0
+
+
+def test_remaining_requests_do_not_pause(clock):
+    limiter = RateLimiter(requests_per_minute=0)
+
+    limiter.update_from_headers(
+        {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "3"}
+    )
+
+    assert limiter.reserve() == 0.0
+
+
+def test_retry_after_is_parsed_as_seconds_or_a_date():
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    assert parse_retry_after("2.5") == 2.5
+    assert 25 < parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_streams_share_the_tap_rate_limiter():
+    tap = Tapsyncro(config={"auth_token": "test"}, parse_env_config=False)
+
+    limiters = {id(stream.rate_limiter) for stream in tap.streams.values()}
+
+    assert limiters == {id(tap.rate_limiter)}
@@ -0,0 +1,25 @@
+"""Tests of the on-disk response cache."""
+
+from tests.benchmarks.mock_api import MockSyncroAPI
+from tests.benchmarks.run import run_stream
+
+
+def test_replay_serves_a_recorded_run_offline(tmp_path):
+    config = {"page_size": 25, "response_cache_dir": str(tmp_path)}
+    with MockSyncroAPI(total_records=60, record_size=20) as recording_api:
+        recorded = run_stream(recording_api, "tickets", config, trace_memory=False)
+
+    with MockSyncroAPI(total_records=0) as offline_api:
+        replayed = run_stream(
+            offline_api,
+            "tickets",
+            {
+                **config,
+                "api_url": recording_api.base_url,
+                "response_cache_replay": True,
+            },
+            trace_memory=False,
+        )
+
+    assert recorded.records == replayed.records == 60
+    assert replayed.requests == 0
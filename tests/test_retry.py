@@ -0,0 +1,79 @@
+"""Tests of the retry policy."""
+
+import pytest
+import requests
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_syncro.retry import CONNECTION_MAX_DELAY, RetryPolicy
+from tests.benchmarks.mock_api import MockSyncroAPI
+from tests.benchmarks.run import run_stream
+
+
+def test_retries_recover_from_gateway_time_outs():
+    config = {"page_size": 25, "retry_base_seconds": 0.01, "retry_max_seconds": 0.05}
+    with MockSyncroAPI(total_records=120, record_size=20, error_rate_504=0.3) as api:
+        result = run_stream(api, "tickets", config, trace_memory=False)
+
+    assert result.records == 120
+    assert api.statuses[504] > 0
+
+
+def test_spent_retry_budget_fails_fast():
+    config = {"retry_base_seconds": 0.01, "retry_budget": 2}
+    with MockSyncroAPI(total_records=120, record_size=20, error_rate_504=1) as api:
+        with pytest.raises(RetriableAPIError):
+            run_stream(api, "tickets", config, trace_memory=False)
+
+    assert api.requests == 3
+
+
+def _waits(policy: RetryPolicy, exceptions: list) -> list:
+    """Return the waits a policy yields for one request failing with `exceptions`."""
+    waits = policy.waits()
+    next(waits)
+    return [waits.send(exception) for exception in exceptions]
+
+
+def _rate_limited(retry_after: str) -> RetriableAPIError:
+    response = requests.Response()
+    response.status_code = 429
+    response.headers["Retry-After"] = retry_after
+    return RetriableAPIError("429 Too Many Requests", response)
+
+
+def test_waits_are_jittered_between_the_base_and_max_delay():
+    policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+
+    waits = _waits(policy, [RetriableAPIError("504")] * 50)
+
+    assert all(1.0 <= wait <= 8.0 for wait in waits)
+    assert len(set(waits)) > 1
+
+
+def test_connection_errors_retry_on_a_shorter_schedule():
+    policy = RetryPolicy(base_delay=30.0, max_delay=300.0)
+
+    waits = _waits(policy, [requests.exceptions.ConnectionError()] * 10)
+
+    assert all(wait <= CONNECTION_MAX_DELAY for wait in waits)
+
+
+def test_rate_limited_requests_wait_as_long_as_retry_after_asks():
+    policy = RetryPolicy(base_delay=0.01, max_delay=0.1)
+
+    assert _waits(policy, [_rate_limited("7")]) == [7.0]
+
+
+def test_the_retry_budget_is_shared_by_every_request():
+    policy = RetryPolicy(base_delay=0.01, max_delay=0.1, budget=3)
+    first, second = policy.waits(), policy.waits()
+    next(first)
+    next(second)
+
+    first.send(RetriableAPIError("504"))
+    second.send(RetriableAPIError("504"))
+    first.send(RetriableAPIError("504"))
+
+    with pytest.raises(StopIteration):
+        second.send(RetriableAPIError("504"))
+    assert policy.retries == 3
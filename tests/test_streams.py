@@ -0,0 +1,128 @@
+"""Tests of the stream types against the mock Syncro API."""
+
+import logging
+
+from tap_syncro.tap import Tapsyncro
+from tests.benchmarks.mock_api import MockSyncroAPI
+from tests.benchmarks.run import run_stream, sync_messages
+
+
+def test_normalized_customers_are_written_once(api):
+    result = run_stream(
+        api,
+        "payments",
+        {"normalize_customers": True},
+        trace_memory=False,
+        extra_streams=["embedded_customers"],
+    )
+
+    assert result.records == 120 + 50
+
+
+def test_line_items_are_derived_from_invoices(api):
+    config = {"page_size": 25, "derive_embedded_records": True}
+    derived = run_stream(
+        api, "invoices", config, trace_memory=False, extra_streams=["line_items"]
+    )
+    paged = run_stream(
+        api,
+        "invoices",
+        {"page_size": 25},
+        trace_memory=False,
+        extra_streams=["line_items"],
+    )
+
+    # The mock embeds two line items in each invoice, and serves 120 of its own.
+    assert derived.records == 120 + 120 * 2
+    assert derived.requests == 5
+    assert paged.records == 120 + 120
+    assert paged.requests == 5 + 5
+
+
+def test_line_items_fall_back_to_their_endpoint_without_embedded_items(caplog):
+    config = {"page_size": 25, "derive_embedded_records": True}
+    # The tap reconfigures logging, replacing the handlers of the root logger.
+    logger = logging.getLogger("tap-syncro")
+    logger.addHandler(caplog.handler)
+    try:
+        with MockSyncroAPI(
+            total_records=120, record_size=20, embed_derived=False
+        ) as api:
+            result = run_stream(
+                api,
+                "invoices",
+                config,
+                trace_memory=False,
+                extra_streams=["line_items"],
+            )
+    finally:
+        logger.removeHandler(caplog.handler)
+
+    assert result.records == 120 + 120
+    assert result.requests == 5 + 5
+    assert "syncing 'line_items' from its own endpoint" in caplog.text
+
+
+def test_one_fetch_feeds_contacts_and_ticket_comments(api):
+    config = {"page_size": 25, "derive_embedded_records": True}
+    customers = run_stream(
+        api, "customers", config, trace_memory=False, extra_streams=["contacts"]
+    )
+    tickets = run_stream(
+        api, "tickets", config, trace_memory=False, extra_streams=["ticket_comments"]
+    )
+
+    assert customers.records == tickets.records == 120 + 120 * 2
+    assert customers.requests == tickets.requests == 5
+
+
+def test_contacts_are_derived_from_a_customers_sync_bounded_by_start_date(api):
+    config = {
+        "page_size": 25,
+        "derive_embedded_records": True,
+        "start_date": "2019-01-01T00:00:00Z",
+    }
+    requests_before = api.requests
+    output = sync_messages(api, ["customers", "contacts"], config)
+
+    assert len(output.records("contacts")) == 120 * 2
+    assert api.requests - requests_before == 5
+
+
+def test_contacts_are_derived_only_from_a_full_customers_sync(api):
+    config = {"page_size": 25, "derive_embedded_records": True}
+    requests_before = api.requests
+    full = sync_messages(api, ["customers", "contacts"], config)
+    full_requests = api.requests - requests_before
+    bookmark = full.state["bookmarks"]["contacts"]["replication_key_value"]
+
+    requests_before = api.requests
+    incremental = sync_messages(api, ["customers", "contacts"], config, full.state)
+    incremental_requests = api.requests - requests_before
+
+    assert len(full.records("contacts")) == 120 * 2
+    assert full_requests == 5
+    # The latest contact embedded in the last customer.
+    assert bookmark == full.records("contacts")[-1]["updated_at"]
+    # /contacts is paged, keeping the one contact not updated before the bookmark.
+    assert incremental_requests == 5 + 5
+    assert [record["updated_at"] for record in incremental.records("contacts")] == [
+        bookmark
+    ]
+
+
+def test_line_items_coerce_string_numbers_only():
+    tap = Tapsyncro(config={"auth_token": "test"}, parse_env_config=False)
+    row = {"discount_dollars": "1.5", "discount_percent": "n/a", "position": 2}
+
+    tap.streams["line_items"].post_process(row)
+
+    assert row == {"discount_dollars": 1.5, "discount_percent": None, "position": 2}
+
+
+def test_every_stream_has_a_primary_key():
+    tap = Tapsyncro(config={"auth_token": "test"}, parse_env_config=False)
+
+    assert {
+        name for name, stream in tap.streams.items() if not stream.primary_keys
+    } == set()
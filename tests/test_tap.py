@@ -0,0 +1,135 @@
+"""Tests of the tap class."""
+
+import importlib.util
+import threading
+
+import pytest
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.streams import core
+
+from tap_syncro import streams
+from tap_syncro.output import OUTPUT_LOCK
+from tap_syncro.tap import Tapsyncro
+from tests.benchmarks.mock_api import MockSyncroAPI
+from tests.benchmarks.run import sync_messages
+
+
+def test_only_selected_streams_and_their_parents_are_constructed():
+    config = {"auth_token": "test"}
+    catalog = Tapsyncro(config=config, parse_env_config=False).catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                selected = entry["tap_stream_id"] == "worksheet_results"
+                metadata["metadata"]["selected"] = selected
+    tap = Tapsyncro(config=config, catalog=catalog, parse_env_config=False)
+
+    assert sorted(tap.streams) == ["tickets", "worksheet_results"]
+
+
+def _lock_held_elsewhere() -> bool:
+    """Return whether OUTPUT_LOCK is held, as seen from another thread."""
+    acquired = []
+
+    def probe() -> None:
+        acquired.append(OUTPUT_LOCK.acquire(blocking=False))
+        if acquired[0]:
+            OUTPUT_LOCK.release()
+
+    thread = threading.Thread(target=probe)
+    thread.start()
+    thread.join()
+    return not acquired[0]
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        "write_starting_replication_value",
+        "write_replication_key_signpost",
+        "increment_state",
+        "reset_state_progress_markers",
+        "finalize_state_progress_markers",
+    ],
+)
+def test_concurrent_streams_update_state_under_the_output_lock(
+    api, monkeypatch, function
+):
+    original = getattr(core, function)
+    unlocked = []
+
+    def checked(*args, **kwargs):
+        if not _lock_held_elsewhere():
+            unlocked.append(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(core, function, checked)
+    output = sync_messages(
+        api, ["tickets", "invoices", "payments"], {"stream_concurrency": 3}
+    )
+
+    assert len(output.records("invoices")) == 120
+    assert unlocked == []
+
+
+def test_concurrent_stream_failure_stops_the_other_streams(monkeypatch):
+    def fail(self, context):
+        raise RuntimeError("invoices failed")
+        yield
+
+    monkeypatch.setattr(streams.InvoicesStream, "get_records", fail)
+    config = {"page_size": 25, "stream_concurrency": 2}
+    with MockSyncroAPI(total_records=1000, record_size=5, latency=0.05) as api:
+        with pytest.raises(RuntimeError, match="invoices failed"):
+            sync_messages(api, ["tickets", "invoices"], config)
+        for thread in threading.enumerate():
+            if thread.name.startswith("stream"):
+                thread.join()
+
+    # Tickets stop at their next request rather than reading all 40 pages.
+    assert api.requests < 10
+
+
+@pytest.mark.parametrize(
+    "package, config, extra",
+    [
+        ("httpx", {"transport": "async"}, "async"),
+        ("orjson", {"fast_output": True}, "fast-output"),
+        (
+            "pyarrow",
+            {"batch_config": {"encoding": {"format": "parquet"}}},
+            "parquet",
+        ),
+    ],
+)
+def test_features_without_their_package_fail_config_validation(
+    monkeypatch, package, config, extra
+):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name, *args: None if name == package else find_spec(name, *args),
+    )
+    config = {"auth_token": "test", **config}
+
+    with pytest.raises(ConfigValidationError, match=rf"tap-syncro\[{extra}\]"):
+        Tapsyncro(config=config, parse_env_config=False)
+
+
+def test_streams_share_one_pooled_session():
+    config = {"auth_token": "test", "max_concurrency": 8, "stream_concurrency": 4}
+    tap = Tapsyncro(config=config, parse_env_config=False)
+
+    sessions = {id(stream.requests_session) for stream in tap.streams.values()}
+
+    assert sessions == {id(tap.requests_session)}
+    assert tap.requests_session.get_adapter("https://x")._pool_maxsize == 32
+
+
+def test_streams_reuse_keep_alive_connections():
+    with MockSyncroAPI(total_records=120, record_size=20) as api:
+        sync_messages(api, ["tickets", "customers", "invoices"], {"page_size": 25})
+
+    assert api.requests == 15
+    assert api.connections == 1